@@ -0,0 +1,79 @@
+# SXTOOLS PREMIUM/core/csint/dns_batch.py
+import asyncio
+import secrets
+import dns.asyncresolver # dnspython
+import dns.exception
+import dns.resolver
+from utils.logger import app_logger
+
+DNS_BATCH_SIZE = 1000 # Noms résolus par lot avant de passer aux sondes HTTP
+DNS_CONCURRENCY = 200 # Requêtes DNS en vol par lot
+DNS_TIMEOUT = 3.0 # Durée de vie d'une résolution (retransmissions du résolveur comprises)
+WILDCARD_SAMPLES = 3 # Labels aléatoires résolus pour détecter un wildcard DNS
+
+def make_resolver(timeout=DNS_TIMEOUT, nameservers=None):
+    """Résolveur asynchrone dnspython, configuré depuis le système (resolv.conf / registre)."""
+    resolver = dns.asyncresolver.Resolver()
+    resolver.lifetime = timeout
+    if nameservers:
+        resolver.nameservers = list(nameservers)
+    return resolver
+
+async def resolve_name(resolver, name, rdtypes=("A", "AAAA")):
+    """
+    Résout `name` en A, puis en AAAA si le nom n'a pas d'adresse IPv4 (les CNAME sont suivis).
+    `rdtypes` change les types essayés dans l'ordre (ex: ("MX", "A", "AAAA") pour un domaine de messagerie).
+    Renvoie (adresses, erreur) : adresses vide si le nom n'existe pas, erreur non nulle si la réponse manque.
+    """
+    for rdtype in rdtypes:
+        try:
+            answer = await resolver.resolve(name, rdtype)
+            return sorted(rdata.to_text() for rdata in answer), None
+        except dns.resolver.NoAnswer:
+            continue
+        except dns.resolver.NXDOMAIN:
+            return [], None
+        except dns.exception.Timeout:
+            return [], "timeout"
+        except dns.resolver.NoNameservers:
+            return [], "servfail"
+        except dns.exception.DNSException as e:
+            app_logger.debug(f"DNS error for {name}: {e}")
+            return [], str(e)
+    return [], None
+
+async def _resolve_batch(names, resolver, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve_one(name):
+        async with semaphore:
+            return await resolve_name(resolver, name)
+
+    return await asyncio.gather(*(resolve_one(name) for name in names))
+
+def resolve_names(names, resolver=None, concurrency=DNS_CONCURRENCY):
+    """Résout un lot de noms en parallèle. Renvoie une liste de (adresses, erreur) dans l'ordre de `names`."""
+    if not names:
+        return []
+    if resolver is None:
+        resolver = make_resolver()
+    return asyncio.run(_resolve_batch(names, resolver, concurrency))
+
+def random_label():
+    """Label aléatoire qui n'a aucune chance d'exister (sondes de wildcard)."""
+    return "sx" + secrets.token_hex(8)
+
+def detect_wildcard(domain, resolver=None, samples=WILDCARD_SAMPLES):
+    """
+    Résout quelques labels aléatoires sous `domain`. Renvoie (adresses, noms) : les adresses renvoyées
+    pour des noms inexistants et les noms aléatoires qui ont résolu. Deux ensembles vides : pas de wildcard.
+    """
+    names = [f"{random_label()}.{domain}" for _ in range(samples)]
+    answers = resolve_names(names, resolver)
+    addresses = set()
+    resolved = []
+    for name, (name_addresses, _) in zip(names, answers):
+        if name_addresses:
+            addresses.update(name_addresses)
+            resolved.append(name)
+    return addresses, resolved
@@ -0,0 +1,99 @@
+# SXTOOLS PREMIUM/core/csint/http_fingerprint.py
+import hashlib
+import html
+import re
+import requests
+from utils.logger import app_logger
+
+MAX_FINGERPRINT_BYTES = 65536 # Lecture bornée du corps : le titre est presque toujours dans les premiers Ko
+READ_CHUNK_SIZE = 4096
+FINGERPRINT_TIMEOUT = 5
+CLUSTER_PREVIEW = 5 # Noms affichés par groupe de réponses identiques
+
+_TITLE_PATTERN = re.compile(rb"<title[^>]*>(.*?)</title", re.IGNORECASE | re.DOTALL)
+_TITLE_END = re.compile(rb"</title", re.IGNORECASE)
+_CHARSET_PATTERN = re.compile(rb"<meta[^>]+charset=[\"']?([\w-]+)", re.IGNORECASE)
+
+def read_head(response, max_bytes=MAX_FINGERPRINT_BYTES):
+    """Lit le corps en flux et s'arrête dès que </title> est passé ou après `max_bytes`."""
+    data = b""
+    for chunk in response.iter_content(READ_CHUNK_SIZE):
+        search_from = max(0, len(data) - 8) # "</title" peut être coupé entre deux blocs
+        data += chunk
+        if _TITLE_END.search(data, search_from) or len(data) >= max_bytes:
+            break
+    response.close() # Le reste du corps n'est jamais téléchargé
+    return data[:max_bytes]
+
+def extract_title(data, encoding=None):
+    match = _TITLE_PATTERN.search(data)
+    if not match:
+        return ""
+    if not encoding:
+        charset = _CHARSET_PATTERN.search(data)
+        encoding = charset.group(1).decode('ascii') if charset else 'utf-8'
+    try:
+        title = match.group(1).decode(encoding, errors='replace')
+    except LookupError: # Charset inconnu annoncé par la page
+        title = match.group(1).decode('utf-8', errors='replace')
+    return " ".join(html.unescape(title).split())[:120]
+
+def fingerprint_url(url, hostname, http=requests, headers=None):
+    """
+    Empreinte d'une page : statut, titre, en-têtes Server et X-Powered-By, cible de redirection et hash
+    du début du corps. Le nom d'hôte est masqué dans le hash et la redirection, pour que des pages parquées
+    identiques sur des noms différents aient la même empreinte. Renvoie un dict, ou None si la page ne répond pas.
+    """
+    try:
+        response = http.get(url, timeout=FINGERPRINT_TIMEOUT, allow_redirects=False, stream=True, headers=headers)
+        data = read_head(response)
+    except requests.exceptions.RequestException as e:
+        app_logger.debug(f"HTTP fingerprint failed for {url}: {e}")
+        return None
+    masked = data.replace(hostname.encode('utf-8'), b"{host}")
+    content_type = response.headers.get('Content-Type', '')
+    encoding = response.encoding if 'charset' in content_type.lower() else None
+    return {
+        "url": url,
+        "status": response.status_code,
+        "title": extract_title(data, encoding),
+        "server": response.headers.get('Server', ''),
+        "powered_by": response.headers.get('X-Powered-By', ''),
+        "location": response.headers.get('Location', '').replace(hostname, '{host}'),
+        "body_hash": hashlib.sha1(masked).hexdigest()[:12],
+    }
+
+def describe(fingerprint):
+    """Résumé d'une ligne : [200] "Titre" nginx, PHP/8.1 -> https://{host}/ #a1b2c3d4e5f6"""
+    parts = [f"[{fingerprint['status']}]"]
+    if fingerprint["title"]:
+        parts.append(f"\"{fingerprint['title']}\"")
+    software = ", ".join(v for v in (fingerprint["server"], fingerprint["powered_by"]) if v)
+    if software:
+        parts.append(software)
+    if fingerprint["location"]:
+        parts.append(f"-> {fingerprint['location']}")
+    parts.append(f"#{fingerprint['body_hash']}")
+    return " ".join(parts)
+
+def cluster_fingerprints(fingerprints):
+    """Regroupe les URLs par empreinte identique. Renvoie [(empreinte, [urls])], les plus gros groupes d'abord."""
+    clusters = {}
+    for fingerprint in fingerprints:
+        key = (fingerprint["status"], fingerprint["title"], fingerprint["server"], fingerprint["powered_by"],
+               fingerprint["location"], fingerprint["body_hash"])
+        clusters.setdefault(key, (fingerprint, []))[1].append(fingerprint["url"])
+    return sorted(clusters.values(), key=lambda item: (-len(item[1]), sorted(item[1])[0]))
+
+def format_clusters(fingerprints):
+    """Une ligne par page distincte : les centaines de pages parquées identiques tiennent sur une seule ligne."""
+    lines = []
+    for fingerprint, urls in cluster_fingerprints(fingerprints):
+        urls = sorted(urls)
+        if len(urls) == 1:
+            lines.append(f"{urls[0]} {describe(fingerprint)}")
+        else:
+            preview = ", ".join(urls[:CLUSTER_PREVIEW])
+            more = f" (+{len(urls) - CLUSTER_PREVIEW} more)" if len(urls) > CLUSTER_PREVIEW else ""
+            lines.append(f"[{len(urls)} hosts] {describe(fingerprint)}: {preview}{more}")
+    return lines
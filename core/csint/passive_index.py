@@ -0,0 +1,237 @@
+# SXTOOLS PREMIUM/core/csint/passive_index.py
+import heapq
+import itertools
+import json
+import mmap
+import os
+import re
+import tempfile
+from utils.logger import app_logger
+
+PASSIVE_INDEX_PATH = os.path.join("data", "passive_subdomains.idx")
+SORT_CHUNK_SIZE = 1000000 # Noms triés en mémoire avant d'être versés dans un fichier temporaire
+
+_HOSTNAME_PATTERN = re.compile(r"(?<![\w.-])(?:\*\.)?((?:[a-z0-9_](?:[a-z0-9_-]{0,61}[a-z0-9_])?\.)+[a-z][a-z0-9-]{0,62})(?![\w-])",
+                               re.IGNORECASE)
+
+def reverse_name(hostname):
+    """www.example.com -> com.example.www : tous les noms sous un domaine deviennent contigus une fois triés."""
+    return ".".join(reversed(hostname.lower().rstrip('.').split('.')))
+
+def _names_from_ct_record(record):
+    for key in ("name_value", "common_name", "dns_names", "domains", "names"):
+        value = record.get(key)
+        if isinstance(value, str):
+            yield from value.split()
+        elif isinstance(value, list):
+            yield from (v for v in value if isinstance(v, str))
+
+def _names_from_zone_line(line, origin):
+    """Nom propriétaire d'un enregistrement de zone (relatif à $ORIGIN ou absolu). Renvoie (nom, origine)."""
+    fields = line.split(';', 1)[0].split()
+    if not fields:
+        return None, origin
+    if fields[0].upper() == "$ORIGIN" and len(fields) > 1:
+        return None, fields[1].rstrip('.').lower()
+    if fields[0].startswith('$') or line[0].isspace():
+        return None, origin # Directive, ou ligne qui reprend le propriétaire précédent
+    owner = fields[0]
+    if owner == "@":
+        return origin, origin
+    if owner.endswith('.'):
+        return owner.rstrip('.'), origin
+    return (f"{owner}.{origin}" if origin else owner), origin
+
+def iter_source_names(path, kind="auto"):
+    """
+    Extrait les noms d'hôte d'une source passive. `kind` :
+    - "ct" : export de Certificate Transparency en JSON lignes ou tableau JSON (name_value, common_name...) ;
+    - "zone" : fichier de zone DNS (gère $ORIGIN et les noms relatifs) ;
+    - "text" : tout le reste (résultats de scans précédents, listes, CSV) : les noms sont repérés dans le texte.
+    "auto" choisit d'après l'extension (.json/.jsonl -> ct, .zone/.db -> zone).
+    """
+    if kind == "auto":
+        extension = os.path.splitext(path)[1].lower()
+        kind = "ct" if extension in (".json", ".jsonl") else "zone" if extension in (".zone", ".db") else "text"
+    origin = None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        if kind == "ct" and f.read(1) == "[":
+            f.seek(0)
+            records = json.load(f) # Tableau JSON (export crt.sh) : pas de lecture en flux possible
+            for record in records:
+                if isinstance(record, dict):
+                    yield from _names_from_ct_record(record)
+            return
+        f.seek(0)
+        for line in f:
+            if kind == "ct":
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    yield from _names_from_ct_record(record)
+            elif kind == "zone":
+                name, origin = _names_from_zone_line(line, origin)
+                if name:
+                    yield name
+            else:
+                for match in _HOSTNAME_PATTERN.finditer(line):
+                    yield match.group(1)
+
+def _normalise(names):
+    for name in names:
+        name = name.strip().lower().rstrip('.')
+        if name.startswith("*."):
+            name = name[2:]
+        if name and '.' in name and ' ' not in name:
+            yield reverse_name(name)
+
+def _write_sorted_chunk(keys, directory):
+    keys.sort()
+    fd, chunk_path = tempfile.mkstemp(prefix="passive_", suffix=".chunk", dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.writelines(key + "\n" for key in keys)
+    return chunk_path
+
+def _iter_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+def build_index(sources, index_path=PASSIVE_INDEX_PATH, merge=True, kind="auto"):
+    """
+    Importe des sources passives dans l'index : un fichier texte de clés inversées (com.example.www), triées
+    et uniques, une par ligne. Tri externe : les noms sont triés par blocs de SORT_CHUNK_SIZE puis fusionnés
+    (heapq.merge) avec l'index existant, la mémoire reste bornée quelle que soit la taille des sources.
+    Renvoie le nombre de noms de l'index.
+    """
+    directory = os.path.dirname(index_path) or "."
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    chunk_paths = []
+    try:
+        for source in sources:
+            names = _normalise(iter_source_names(source, kind))
+            while True:
+                keys = list(itertools.islice(names, SORT_CHUNK_SIZE))
+                if not keys:
+                    break
+                chunk_paths.append(_write_sorted_chunk(keys, directory))
+            app_logger.info(f"Imported passive source {source}")
+        streams = [_iter_lines(path) for path in chunk_paths]
+        if merge and os.path.exists(index_path):
+            streams.append(_iter_lines(index_path))
+        count = 0
+        previous = None
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            for key in heapq.merge(*streams):
+                if key != previous:
+                    out.write(key + "\n")
+                    count += 1
+                    previous = key
+        os.replace(tmp_path, index_path) # L'index en service n'est jamais à moitié écrit
+    finally:
+        for path in chunk_paths:
+            os.remove(path)
+    app_logger.info(f"Passive index {index_path} now holds {count} names")
+    return count
+
+class PassiveIndex:
+    """
+    Index passif en lecture, projeté en mémoire (mmap) : rien n'est chargé, le système ne lit que les pages
+    touchées. Une recherche est une dichotomie sur les octets du fichier suivie d'un parcours de la plage
+    des clés qui commencent par le domaine inversé.
+    """
+    def __init__(self, index_path=PASSIVE_INDEX_PATH):
+        self.path = index_path
+        self._file = open(index_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _line_start(self, position):
+        """Début de la ligne qui contient `position`."""
+        return self._map.rfind(b"\n", 0, position) + 1
+
+    def _lower_bound(self, key):
+        """Position de la première ligne >= key (dichotomie sur les octets, recalée en début de ligne)."""
+        low, high = 0, len(self._map)
+        while low < high:
+            middle = self._line_start((low + high) // 2)
+            end = self._map.find(b"\n", middle)
+            end = len(self._map) if end < 0 else end
+            if self._map[middle:end] < key:
+                low = end + 1
+            else:
+                high = middle
+        return low
+
+    def names_under(self, domain, include_self=False):
+        """Tous les noms connus sous `domain` (ex: www.example.com, a.b.example.com pour example.com)."""
+        if self._map is None or not domain:
+            return
+        root = reverse_name(domain).encode('utf-8')
+        prefix = root + b"."
+        # Recherche exacte pour le domaine lui-même : ses voisins ("com.example-foo", '-' < '.') se trouvent
+        # entre lui et ses sous-domaines, un seul parcours depuis `root` s'arrêterait sur eux
+        if include_self and self._key_at(self._lower_bound(root)) == root:
+            yield domain.lower().rstrip('.')
+        position = self._lower_bound(prefix)
+        while position < len(self._map):
+            key = self._key_at(position)
+            if not key.startswith(prefix):
+                return
+            yield reverse_name(key.decode('utf-8'))
+            position += len(key) + 1
+
+    def _key_at(self, position):
+        """Clé de la ligne qui commence à `position` (b"" en fin de fichier)."""
+        end = self._map.find(b"\n", position)
+        return self._map[position:len(self._map) if end < 0 else end]
+
+def passive_names(domain, index_path=PASSIVE_INDEX_PATH):
+    """Noms connus sous `domain` dans l'index passif (liste vide si l'index n'existe pas)."""
+    if not os.path.exists(index_path):
+        return []
+    with PassiveIndex(index_path) as index:
+        return list(index.names_under(domain))
+
+def import_passive_sources(paths, index_path=PASSIVE_INDEX_PATH):
+    """Point d'entrée pour l'interface : importe un ou plusieurs fichiers (séparés par des virgules)."""
+    if isinstance(paths, str):
+        paths = [p.strip() for p in paths.split(",") if p.strip()]
+    if not paths:
+        return "Error: No source file given."
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        return f"Error: Source file(s) not found: {', '.join(missing)}"
+    try:
+        count = build_index(paths, index_path)
+    except (OSError, ValueError) as e:
+        app_logger.error(f"Passive import failed: {e}")
+        return f"Error importing passive sources: {e}"
+    return f"Imported {len(paths)} source(s) into {index_path}: {count} unique names indexed."
+
+if __name__ == '__main__':
+    import sys
+    # Import : python -m core.csint.passive_index import crtsh_export.json zone.db old_results.txt
+    # Requête : python -m core.csint.passive_index query example.com
+    if len(sys.argv) >= 3 and sys.argv[1] == "import":
+        print(import_passive_sources(sys.argv[2:]))
+    elif len(sys.argv) == 3 and sys.argv[1] == "query":
+        for name in passive_names(sys.argv[2]):
+            print(name)
+    else:
+        print("Usage: python -m core.csint.passive_index import <files...> | query <domain>")
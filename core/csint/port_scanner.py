@@ -1,11 +1,32 @@
+import asyncio
+import ipaddress
+import itertools
 import socket
-import threading
-from queue import Queue
 from utils.logger import app_logger
+from utils.config_manager import load_config
+from utils.checkpoint import Checkpoint, default_checkpoint_path, load_checkpoint
+from utils.rate_limiter import Pacer
+from core.csint.target_parser import parse_target_spec, parse_scope, apply_scope, iter_hosts, count_hosts
+from core.csint.rtt_estimator import MIN_TIMEOUT, RttTracker
+from core.csint.port_spec import PortSet, TopPorts, parse_top_ports, service_name
+from core.csint.udp_probes import UdpProber
+from core.csint.service_fingerprint import Fingerprinter
+from core.csint.tls_certs import CertHarvester, TLS_PORTS
+from utils.worker_pool import run_coroutine
 
-# Un pool de threads pour le scan
-NUM_THREADS = 20
-q = Queue()
+# Moteur asynchrone : nombre max de tentatives de connexion simultanées
+ASYNC_CONCURRENCY = 1000
+CONNECT_TIMEOUT = 0.5 # Timeout fixe de async_port_scan ; le moteur adapte le sien au RTT mesuré
+MAX_RETRIES = 2 # Retransmissions max pour un port sans réponse
+# Attente totale max pour un port sans réponse, retransmissions comprises (au moins le premier timeout) :
+# un port filtré ne coûte pas plus cher qu'avec le timeout fixe
+PORT_TIME_BUDGET = CONNECT_TIMEOUT
+
+# Cadence (voir utils.rate_limiter.Pacer) : la concurrence démarre à INITIAL_CONCURRENCY et s'adapte aux pertes
+INITIAL_CONCURRENCY = 100
+PROBE_RATE_LIMIT = None # Sondes/s max au total (None = pas de limite)
+PROBE_RATE_PER_TARGET = None # Sondes/s max par hôte (None = pas de limite)
+DEFAULT_TOP_PORTS = 20 # Ports scannés quand aucun n'est précisé
 
 def port_scan(target_host, port):
     """Scanne un port unique."""
@@ -24,108 +45,383 @@ def port_scan(target_host, port):
     finally:
         sock.close()
 
-def worker(target_ip, open_ports_list, errors_list):
-    """Travailleur pour le pool de threads."""
-    while not q.empty():
-        port = q.get()
-        if port_scan(target_ip, port):
-            open_ports_list.append(port)
-        q.task_done()
-
-def parse_ports(ports_str):
-    """Parse la chaîne de ports (ex: "80,443,21-25,1000")."""
-    parsed_ports = set()
-    if not ports_str.strip(): # Si vide, scanner les ports communs
-        common_ports = [21, 22, 23, 25, 53, 80, 110, 135,139, 143, 443, 445, 993, 995, 1723, 3306, 3389, 5900, 8080, 8443]
-        return sorted(list(common_ports))
-
-    parts = ports_str.split(',')
-    for part in parts:
-        part = part.strip()
-        if '-' in part:
-            start, end = part.split('-', 1)
-            try:
-                start_port = int(start)
-                end_port = int(end)
-                if 0 < start_port <= end_port <= 65535:
-                    for p in range(start_port, end_port + 1):
-                        parsed_ports.add(p)
-                else:
-                    raise ValueError("Port range invalid.")
-            except ValueError:
-                raise ValueError(f"Invalid port range: {part}")
+def _max_concurrency(requested):
+    """Borne la concurrence par la limite de descripteurs de fichiers du système."""
+    try:
+        import resource # N'existe pas sous Windows
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, ValueError, OSError):
+        return requested
+    if soft_limit == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft_limit - 64)) # Garder de la marge pour le reste de l'appli
+
+async def _probe_port(target_ip, port, timeout):
+    """
+    Tente une connexion TCP non bloquante. Renvoie (état, rtt) avec état parmi
+    "open", "closed" (RST reçu), "filtered" (timeout) ou "error" ; rtt vaut None sans réponse.
+    """
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ':' in target_ip else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    start = loop.time()
+    try:
+        await asyncio.wait_for(loop.sock_connect(sock, (target_ip, port)), timeout)
+        return "open", loop.time() - start
+    except asyncio.TimeoutError:
+        return "filtered", None
+    except ConnectionRefusedError:
+        return "closed", loop.time() - start # Le RST donne aussi une mesure du RTT
+    except OSError:
+        return "error", None # Réseau injoignable, etc.
+    finally:
+        sock.close()
+
+async def async_port_scan(target_ip, port, timeout=CONNECT_TIMEOUT):
+    """Version non bloquante de port_scan (connexion TCP complète)."""
+    state, _ = await _probe_port(target_ip, port, timeout)
+    return state == "open"
+
+class PortScanner:
+    """
+    Un scan de ports autonome : sa propre file de travail (l'itérateur de couples (ip, port)), ses coroutines,
+    ses résultats et sa cadence. Aucun état de module n'est partagé, plusieurs scans peuvent donc tourner
+    en même temps dans le même processus, chacun sur sa boucle ou tous sur la boucle d'un ScanPool.
+    """
+    def __init__(self, concurrency=ASYNC_CONCURRENCY, rtt_tracker=None, max_retries=MAX_RETRIES, on_open=None,
+                 stop_after=None, progress=None, results=None, checkpoint=None, pacer=None, protocol="tcp",
+                 fingerprinter=None, cert_harvester=None):
+        self.concurrency = _max_concurrency(concurrency)
+        self.rtt_tracker = rtt_tracker if rtt_tracker is not None else RttTracker(CONNECT_TIMEOUT)
+        self.max_retries = max_retries
+        self.pacer = pacer if pacer is not None else make_pacer(self.concurrency)
+        self.protocol = protocol
+        if protocol != "tcp":
+            fingerprinter = cert_harvester = None # Les réponses UDP ne se prêtent ni aux bannières ni à TLS
+        self.fingerprinter = fingerprinter
+        self.cert_harvester = cert_harvester
+        self.results = results if results is not None else {}
+        self.hits = sum(len(ports) for ports in self.results.values())
+        self.on_open = on_open
+        self.stop_after = stop_after
+        self.progress = progress
+        self.checkpoint = checkpoint
+
+    def stopped(self):
+        return self.stop_after is not None and self.hits >= self.stop_after
+
+    def add_open(self, target_ip, port):
+        open_ports = self.results.setdefault(target_ip, [])
+        if port in open_ports: # Déjà trouvé avant une reprise
+            return
+        open_ports.append(port)
+        self.hits += 1
+        app_logger.info(f"Open port found: {target_ip}:{port}")
+        if self.on_open:
+            self.on_open(target_ip, port) # Résultat remonté dès sa découverte
+        if self.progress:
+            self.progress.result(f"{target_ip}:{port}/{self.protocol} ({service_name(port, self.protocol)}) open")
+        if self.fingerprinter:
+            self.fingerprinter.submit(target_ip, port) # Identification en parallèle du scan
+        if self.cert_harvester and port in TLS_PORTS:
+            self.cert_harvester.submit(target_ip, port) # Les autres ports TLS arrivent via le fingerprinter
+
+    async def _worker(self, work_iter, probe):
+        # L'itérateur est propre à ce scan : chaque coroutine prend le couple (ip, port) suivant dès qu'elle est
+        # libre, et s'arrête quand il est épuisé (pas de test "file vide" qui pourrait faire sortir trop tôt)
+        for index, (target_ip, port) in work_iter:
+            if self.stopped():
+                return
+            if self.checkpoint:
+                self.checkpoint.begin(index)
+            await self.pacer.acquire_async(target_ip)
+            budget = max(PORT_TIME_BUDGET, self.rtt_tracker.timeout_for(target_ip))
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.rtt_tracker.retransmissions += 1
+                timeout = min(self.rtt_tracker.timeout_for(target_ip, attempt), budget)
+                probe_state, rtt = await probe(target_ip, port, timeout)
+                budget -= timeout
+                if rtt is not None:
+                    self.rtt_tracker.add_sample(target_ip, rtt)
+                # Seuls les timeouts justifient une retransmission, tant qu'il reste du budget pour ce port
+                if probe_state != "filtered" or budget < MIN_TIMEOUT:
+                    break
+            # Réponse du premier coup = succès ; réponse après retransmission = perte avérée ; sans réponse = sonde
+            # terminée, qui fait grandir la fenêtre : seule une hausse brutale des timeouts la réduit (voir Pacer)
+            if rtt is None:
+                await self.pacer.release_async(None, timed_out=probe_state == "filtered")
+            else:
+                await self.pacer.release_async(attempt == 0)
+            if probe_state == "open" and not self.stopped():
+                self.add_open(target_ip, port)
+            if self.progress:
+                self.progress.advance()
+            if self.checkpoint:
+                self.checkpoint.finish(index)
+
+    async def scan(self, work_iter, start_offset=0):
+        """Coroutine du scan : consomme `work_iter` (couples (ip, port)) et renvoie {ip: [ports ouverts triés]}."""
+        work_iter = enumerate(work_iter, start_offset)
+        udp_prober = UdpProber() if self.protocol == "udp" else None
+        probe = udp_prober.probe if udp_prober else _probe_port
+        try:
+            await asyncio.gather(*(self._worker(work_iter, probe) for _ in range(self.concurrency)))
+            if self.fingerprinter:
+                await self.fingerprinter.drain()
+            if self.cert_harvester:
+                await self.cert_harvester.drain()
+        finally:
+            if udp_prober:
+                udp_prober.close()
+        for ports in self.results.values():
+            ports.sort()
+        return self.results
+
+    def run(self, work_iter, start_offset=0, pool=None):
+        """Exécute le scan jusqu'au bout : sur la boucle partagée de `pool` (utils.worker_pool.ScanPool) ou sur une boucle privée."""
+        return run_coroutine(self.scan(work_iter, start_offset), pool)
+
+def async_scan_work(work_iter, concurrency=ASYNC_CONCURRENCY, rtt_tracker=None, max_retries=MAX_RETRIES,
+                    on_open=None, stop_after=None, progress=None, results=None, checkpoint=None, start_offset=0,
+                    pacer=None, protocol="tcp", fingerprinter=None, cert_harvester=None, pool=None):
+    """
+    Moteur commun : consomme un itérateur de couples (ip, port) avec au plus `concurrency`
+    connexions en vol. Les timeouts sont dérivés du RTT mesuré par cible (voir rtt_estimator)
+    et un port sans réponse est retenté au plus `max_retries` fois, dans la limite de PORT_TIME_BUDGET.
+    `on_open(ip, port)` est appelé à chaque port ouvert trouvé ; `stop_after` arrête le scan après K ports ouverts.
+    `progress` (utils.progress.ProgressReporter) reçoit l'avancement et les ports ouverts au fil de l'eau.
+    `checkpoint` (utils.checkpoint.Checkpoint) suit les éléments terminés, numérotés à partir de `start_offset` ;
+    `results` permet de repartir des ports déjà trouvés.
+    `pacer` (utils.rate_limiter.Pacer) cadence les sondes ; par défaut, un Pacer plafonné à `concurrency`.
+    `protocol="udp"` envoie des sondes UDP spécifiques au protocole (voir udp_probes) sur un socket partagé.
+    `fingerprinter` (service_fingerprint.Fingerprinter) identifie les services des ports TCP ouverts pendant le scan.
+    `cert_harvester` (tls_certs.CertHarvester) récupère les certificats des ports TLS ouverts pendant le scan.
+    `pool` (utils.worker_pool.ScanPool) fait tourner le scan sur une boucle partagée avec les autres scans.
+    Renvoie {ip: [ports ouverts triés]} ; passer un RttTracker pour récupérer les statistiques RTT.
+    """
+    scanner = PortScanner(concurrency, rtt_tracker, max_retries, on_open, stop_after, progress, results, checkpoint,
+                          pacer, protocol, fingerprinter, cert_harvester)
+    return scanner.run(work_iter, start_offset, pool)
+
+def make_pacer(concurrency=ASYNC_CONCURRENCY):
+    """Pacer par défaut du port scanner (limites de débit du module, concurrence adaptative)."""
+    concurrency = _max_concurrency(concurrency)
+    return Pacer(concurrency, min_concurrency=min(10, concurrency), initial_concurrency=INITIAL_CONCURRENCY,
+                 global_rate=PROBE_RATE_LIMIT, per_target_rate=PROBE_RATE_PER_TARGET)
+
+def async_scan_ports(target_ip, ports, concurrency=ASYNC_CONCURRENCY, rtt_tracker=None, pool=None):
+    """
+    Scanne les ports avec asyncio : des milliers de connexions en vol au lieu de 20 threads bloquants.
+    Renvoie la liste triée des ports ouverts (mêmes résultats que port_scan port par port).
+    """
+    concurrency = min(concurrency, len(ports)) or 1
+    results = async_scan_work(((target_ip, port) for port in ports), concurrency, rtt_tracker,
+                              pacer=make_pacer(concurrency), pool=pool)
+    return results.get(target_ip, [])
+
+def iter_work(sources, ports, start_offset=0):
+    """
+    Ordre de scan entrelacé : pour chaque port, on passe sur tous les hôtes avant le port suivant,
+    pour qu'un hôte lent n'accapare pas les connexions. Les adresses sont regénérées à chaque passe
+    au lieu d'être stockées, la mémoire reste donc constante même pour un /16.
+    `start_offset` saute les `start_offset` premiers couples (reprise depuis un checkpoint).
+    """
+    skip_ports, skip_hosts = 0, 0
+    if start_offset:
+        host_count = count_hosts(sources)
+        skip_ports, skip_hosts = divmod(start_offset, host_count) if host_count else (0, 0)
+    for port in itertools.islice(ports, skip_ports, None):
+        for target_ip in itertools.islice(iter_hosts(sources), skip_hosts, None):
+            yield target_ip, port
+        skip_hosts = 0
+
+def parse_ports(ports_str, protocol="tcp"):
+    """
+    Parse la chaîne de ports (ex: "80,443,21-25,1000") en PortSet (plages, itération paresseuse).
+    "top100" donne les 100 ports les plus probables, dans l'ordre de probabilité.
+    """
+    if not ports_str.strip(): # Si vide, scanner les ports les plus courants
+        return TopPorts(DEFAULT_TOP_PORTS, protocol)
+    top_ports = parse_top_ports(ports_str, protocol)
+    if top_ports is not None:
+        return top_ports
+    return PortSet.parse(ports_str)
+
+
+def _format_open_ports(open_ports, protocol="tcp", target_ip=None, services=None):
+    result_str = ""
+    suffix = "/udp" if protocol == "udp" else ""
+    for port in open_ports:
+        identified = services.get((target_ip, port)) if services else None
+        if identified:
+            # Le service identifié prime sur le nom standard du port (souvent faux sur un port non standard)
+            name, detail = identified
+            result_str += f"Port {port}{suffix} ({name}): Open" + (f" - {detail}" if detail else "") + "\n"
         else:
-            try:
-                port_num = int(part)
-                if 0 < port_num <= 65535:
-                    parsed_ports.add(port_num)
-                else:
-                    raise ValueError("Port number out of range.")
-            except ValueError:
-                raise ValueError(f"Invalid port number: {part}")
-    return sorted(list(parsed_ports))
-
-
-def scan_ports_handler(target_host, ports_str):
-    app_logger.info(f"Port scan initiated for target: {target_host}, ports: {ports_str}")
-    if not target_host:
+            result_str += f"Port {port}{suffix} ({service_name(port, protocol)}): Open\n"
+    return result_str
+
+def scan_targets_handler(targets, ports_str, scope=None, concurrency=ASYNC_CONCURRENCY, on_open=None, stop_after=None,
+                         progress=None, checkpoint_path=None, start_offset=0, previous_results=None, protocol="tcp",
+                         fingerprint=False, harvest_certs=False, pool=None):
+    """
+    Scanne plusieurs cibles (liste, fichier '@cibles.txt', blocs CIDR, noms d'hôte).
+    `scope` est la liste blanche des réseaux autorisés ; par défaut celle de la config ("scan_scope").
+    Avec "topN" comme ports, `stop_after` permet un tri rapide : arrêt après K ports ouverts.
+    L'avancement est sauvegardé périodiquement dans `checkpoint_path` (par défaut sous checkpoints/),
+    voir resume_scan pour reprendre un scan interrompu.
+    `protocol="udp"` (ou des ports préfixés par "udp:", ex: "udp:53,123,161") active le scan UDP.
+    `fingerprint=True` lit les bannières des ports TCP ouverts pour identifier les services.
+    `harvest_certs=True` récupère les certificats TLS des ports ouverts (443, 8443...) ; les noms trouvés
+    (CN et SAN) deviennent des candidats pour subdomain_finder.find_subdomains.
+    `pool` (utils.worker_pool.ScanPool) partage une boucle asyncio entre plusieurs scans lancés en même temps.
+    """
+    if ports_str.strip().lower().startswith("udp:"):
+        protocol, ports_str = "udp", ports_str.strip()[4:]
+    app_logger.info(f"Port scan initiated for targets: {targets}, ports: {ports_str} ({protocol})")
+    if not targets or (isinstance(targets, str) and not targets.strip()):
         return "Error: Target host cannot be empty."
 
+    if scope is None:
+        scope = load_config().get("scan_scope", [])
     try:
-        target_ip = socket.gethostbyname(target_host)
-    except socket.gaierror:
-        app_logger.error(f"Cannot resolve hostname: {target_host}")
-        return f"Error: Cannot resolve hostname '{target_host}'"
+        sources = parse_target_spec(targets)
+        sources, skipped = apply_scope(sources, parse_scope(scope))
+    except ValueError as e:
+        app_logger.error(f"Invalid target specification: {targets} - {e}")
+        return f"Error: {e}"
+    except OSError as e:
+        app_logger.error(f"Error reading target file: {e}")
+        return f"Error reading target file: {e}"
 
     try:
-        ports_to_scan = parse_ports(ports_str)
+        ports_to_scan = parse_ports(ports_str, protocol)
         if not ports_to_scan: # S'il n'y a pas de ports après parsing (ex: string vide après trim)
-             ports_to_scan = parse_ports("") # Utiliser les ports par défaut
+             ports_to_scan = parse_ports("", protocol) # Utiliser les ports par défaut
     except ValueError as e:
         app_logger.error(f"Invalid port specification: {ports_str} - {e}")
         return f"Error: Invalid port specification - {e}"
 
-    app_logger.info(f"Scanning {target_ip} for ports: {ports_to_scan}")
-
-    for port in ports_to_scan:
-        q.put(port)
-
-    open_ports = []
-    errors = [] # Pourrait être utilisé pour collecter des erreurs spécifiques par thread
-
-    threads = []
-    for _ in range(min(NUM_THREADS, len(ports_to_scan))): # Ne pas créer plus de threads que de ports
-        t = threading.Thread(target=worker, args=(target_ip, open_ports, errors), daemon=True)
-        threads.append(t)
-        t.start()
-
-    q.join() # Attendre que tous les items de la queue soient traités
-
-    # S'assurer que tous les threads sont terminés (normalement q.join() suffit)
-    # for t in threads:
-    #    t.join()
-
-    result_str = f"Port Scan Results for {target_host} ({target_ip}):\n"
-    result_str += "----------------------------------------\n"
-    if open_ports:
-        open_ports.sort()
-        for port in open_ports:
-            service_name = "unknown"
-            try:
-                service_name = socket.getservbyport(port)
-            except OSError: # ou socket.error
-                pass # Garder "unknown"
-            result_str += f"Port {port} ({service_name}): Open\n"
-        app_logger.info(f"Open ports found on {target_ip}: {open_ports}")
+    if not sources:
+        return "Error: No target left in the authorised scope.\nSkipped (out of scope): " + ", ".join(skipped)
+
+    app_logger.info(f"Scanning {count_hosts(sources)} host(s) for {len(ports_to_scan)} port(s)")
+    if progress:
+        progress.set_total(count_hosts(sources) * len(ports_to_scan))
+        progress.advance(start_offset)
+
+    errors = []
+    rtt_tracker = RttTracker(CONNECT_TIMEOUT)
+    pacer = make_pacer(concurrency)
+    cert_harvester = None
+    if harvest_certs:
+        # SNI : pour une cible donnée par son nom, on présente ce nom (hébergement virtuel)
+        server_names = {str(network.network_address): label for network, label, _ in sources
+                        if network.num_addresses == 1 and label != str(network.network_address)}
+        cert_harvester = CertHarvester(progress=progress, server_names=server_names)
+    fingerprinter = Fingerprinter(progress=progress, tls_harvester=cert_harvester) if fingerprint else None
+    services = fingerprinter.results if fingerprinter else None
+    results = previous_results if previous_results is not None else {}
+    if checkpoint_path is None:
+        checkpoint_path = default_checkpoint_path("portscan", f"{targets}_{protocol}_{ports_str}")
+    checkpoint = Checkpoint(checkpoint_path, lambda: {
+        "kind": "portscan", "targets": targets, "ports": str(ports_to_scan), "protocol": protocol, "scope": scope,
+        "fingerprint": fingerprint, "harvest_certs": harvest_certs, "stop_after": stop_after,
+        "results": {ip: list(ports) for ip, ports in results.items()},
+    }, start_offset=start_offset)
+    try:
+        results = async_scan_work(iter_work(sources, ports_to_scan, start_offset), concurrency=concurrency,
+                                  rtt_tracker=rtt_tracker, on_open=on_open, stop_after=stop_after, progress=progress,
+                                  results=results, checkpoint=checkpoint, start_offset=start_offset, pacer=pacer,
+                                  protocol=protocol, fingerprinter=fingerprinter, cert_harvester=cert_harvester,
+                                  pool=pool)
+        checkpoint.complete()
+    except Exception as e:
+        app_logger.error(f"Async scan failed for {targets}: {e}", exc_info=True)
+        checkpoint.save()
+        errors.append(f"Scan engine error: {e}")
+        errors.append(f"Progress saved, resume with resume_scan('{checkpoint_path}').")
+    if progress:
+        progress.flush()
+
+    single_host = len(sources) == 1 and sources[0][0].num_addresses == 1
+    if single_host:
+        # Format historique pour une cible unique
+        network, label, _ = sources[0]
+        target_ip = str(network.network_address)
+        open_ports = results.get(target_ip, [])
+        result_str = f"Port Scan Results for {label} ({target_ip}):\n"
+        result_str += "----------------------------------------\n"
+        srtt = rtt_tracker.srtt_for(target_ip)
+        if srtt is not None:
+            result_str += f"Smoothed RTT: {srtt * 1000:.1f} ms\n"
+        if open_ports:
+            result_str += _format_open_ports(open_ports, protocol, target_ip, services)
+            app_logger.info(f"Open ports found on {target_ip}: {open_ports}")
+        else:
+            result_str += "No open ports found in the specified range.\n"
+            app_logger.info(f"No open ports found on {target_ip} for specified range.")
     else:
-        result_str += "No open ports found in the specified range.\n"
-        app_logger.info(f"No open ports found on {target_ip} for specified range.")
-    
+        labels = {str(network.network_address): label for network, label, _ in sources if network.num_addresses == 1}
+        result_str = f"Port Scan Results for {len(sources)} target(s) ({count_hosts(sources)} host(s)):\n"
+        result_str += "----------------------------------------\n"
+        if results:
+            for target_ip in sorted(results, key=ipaddress.ip_address):
+                label = labels.get(target_ip, target_ip)
+                header = f"{label} ({target_ip})" if label != target_ip else target_ip
+                srtt = rtt_tracker.srtt_for(target_ip)
+                if srtt is not None:
+                    header += f" - SRTT {srtt * 1000:.1f} ms"
+                result_str += f"\n[{header}]\n" + _format_open_ports(results[target_ip], protocol, target_ip, services)
+            app_logger.info(f"Open ports found on {len(results)} host(s).")
+        else:
+            result_str += "No open ports found on any target in the specified range.\n"
+            app_logger.info("No open ports found on any target.")
+
+    if stop_after is not None and sum(len(ports) for ports in results.values()) >= stop_after:
+        result_str += f"\nScan stopped early after {stop_after} open port(s).\n"
+
+    if protocol == "udp":
+        result_str += "\nNote: UDP ports that never answered are open|filtered and are not listed.\n"
+
+    if cert_harvester:
+        result_str += cert_harvester.summary()
+
+    result_str += "\n" + rtt_tracker.summary() + "\n"
+    result_str += pacer.summary() + "\n"
+
+    if skipped:
+        result_str += "\nSkipped (out of scope): " + ", ".join(skipped) + "\n"
+
     if errors:
         result_str += "\nErrors during scan:\n" + "\n".join(errors)
 
     return result_str
 
+def resume_scan(checkpoint_path, concurrency=ASYNC_CONCURRENCY, progress=None, pool=None):
+    """Reprend un scan de ports interrompu à partir de son checkpoint, avec les mêmes options (empreintes, certificats, arrêt)."""
+    try:
+        data = load_checkpoint(checkpoint_path)
+    except ValueError as e:
+        app_logger.error(str(e))
+        return f"Error: {e}"
+    if data.get("kind") != "portscan":
+        return f"Error: {checkpoint_path} is not a port scan checkpoint."
+    app_logger.info(f"Resuming port scan from {checkpoint_path} at offset {data['offset']}")
+    return scan_targets_handler(data["targets"], data["ports"], scope=data.get("scope"), concurrency=concurrency,
+                                progress=progress, checkpoint_path=checkpoint_path, start_offset=data["offset"],
+                                previous_results=data.get("results", {}), protocol=data.get("protocol", "tcp"),
+                                stop_after=data.get("stop_after"), fingerprint=data.get("fingerprint", False),
+                                harvest_certs=data.get("harvest_certs", False), pool=pool)
+
+def scan_ports_handler(target_host, ports_str="", concurrency=ASYNC_CONCURRENCY, on_open=None, stop_after=None, progress=None,
+                       fingerprint=False, harvest_certs=False, pool=None):
+    # Une seule cible ou une spécification multiple (CIDR, liste, fichier) : même moteur
+    return scan_targets_handler(target_host, ports_str, concurrency=concurrency, on_open=on_open, stop_after=stop_after,
+                                progress=progress, fingerprint=fingerprint, harvest_certs=harvest_certs, pool=pool)
+
 if __name__ == '__main__':
     # Test
     # Pour tester, il faut une machine cible. Utilisez 'localhost' ou une IP de test.
@@ -0,0 +1,173 @@
+# SXTOOLS PREMIUM/core/csint/port_spec.py
+import bisect
+import functools
+import os
+import re
+import socket
+import sys
+
+# Ports TCP classés par fréquence d'ouverture observée (ordre des "top ports" de nmap)
+TOP_TCP_PORTS = [
+    80, 23, 443, 21, 22, 25, 3389, 110, 445, 139, 143, 53, 135, 3306, 8080, 1723, 111, 995, 993, 5900,
+    1025, 587, 8888, 199, 1720, 465, 548, 113, 81, 6001, 10000, 514, 5060, 179, 1026, 2000, 8443, 8000, 32768, 554,
+    26, 1433, 49152, 2001, 515, 8008, 49154, 1027, 5666, 646, 5000, 5631, 631, 49153, 8081, 2049, 88, 79, 5800, 106,
+    2121, 1110, 49155, 6000, 513, 990, 5357, 427, 49156, 543, 544, 5101, 144, 7, 389, 8009, 3128, 444, 9999, 5009,
+    7070, 5190, 3000, 5432, 1900, 3986, 13, 1029, 9, 5051, 6646, 49157, 1028, 873, 1755, 2717, 4899, 9100, 119, 37,
+]
+
+# Ports UDP les plus souvent ouverts, même principe
+TOP_UDP_PORTS = [
+    631, 161, 137, 123, 138, 1434, 445, 135, 67, 53, 139, 500, 68, 520, 1900, 4500, 514, 49152, 162, 69,
+    5353, 111, 49154, 1701, 998, 996, 997, 999, 3283, 49153,
+]
+
+TOP_PORTS_PATTERN = re.compile(r'^top\s*[:=]?\s*(\d+)$', re.IGNORECASE)
+
+class PortSet:
+    """
+    Ensemble de ports stocké sous forme de plages (début, fin) triées et fusionnées.
+    "1-65535" tient en un seul tuple ; les ports ne sont générés qu'à l'itération.
+    """
+    __slots__ = ("ranges", "_starts", "_len")
+
+    def __init__(self, ranges=()):
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self.ranges = tuple(merged)
+        self._starts = [start for start, _ in merged]
+        self._len = sum(end - start + 1 for start, end in merged)
+
+    @classmethod
+    def from_ports(cls, ports):
+        return cls((port, port) for port in ports)
+
+    @classmethod
+    def parse(cls, ports_str):
+        """Parse une chaîne de ports (ex: "80,443,21-25,1000")."""
+        ranges = []
+        for part in ports_str.split(','):
+            part = part.strip()
+            if '-' in part:
+                start, end = part.split('-', 1)
+                try:
+                    start_port = int(start)
+                    end_port = int(end)
+                    if not 0 < start_port <= end_port <= 65535:
+                        raise ValueError("Port range invalid.")
+                except ValueError:
+                    raise ValueError(f"Invalid port range: {part}")
+                ranges.append((start_port, end_port))
+            else:
+                try:
+                    port_num = int(part)
+                    if not 0 < port_num <= 65535:
+                        raise ValueError("Port number out of range.")
+                except ValueError:
+                    raise ValueError(f"Invalid port number: {part}")
+                ranges.append((port_num, port_num))
+        return cls(ranges)
+
+    def __iter__(self):
+        for start, end in self.ranges:
+            yield from range(start, end + 1)
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, port):
+        index = bisect.bisect_right(self._starts, port) - 1
+        return index >= 0 and port <= self.ranges[index][1]
+
+    def __eq__(self, other):
+        return isinstance(other, PortSet) and self.ranges == other.ranges
+
+    def __str__(self):
+        return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in self.ranges)
+
+    def __repr__(self):
+        return f"PortSet('{self}')"
+
+class TopPorts:
+    """
+    Les N ports les plus probables, dans l'ordre de probabilité (et non l'ordre numérique).
+    Au-delà de la table, on complète avec les ports restants dans l'ordre croissant.
+    """
+    __slots__ = ("count", "table")
+
+    def __init__(self, count, proto="tcp"):
+        if not 0 < count <= 65535:
+            raise ValueError(f"Invalid top ports count: {count}")
+        self.count = count
+        self.table = TOP_UDP_PORTS if proto == "udp" else TOP_TCP_PORTS
+
+    def __iter__(self):
+        yield from self.table[:self.count]
+        remaining = self.count - len(self.table)
+        if remaining > 0:
+            known = set(self.table)
+            for port in range(1, 65536):
+                if remaining == 0:
+                    break
+                if port not in known:
+                    remaining -= 1
+                    yield port
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, port):
+        return port in self.table[:self.count] or (self.count > len(self.table) and port in set(self))
+
+    def __str__(self):
+        return f"top{self.count}"
+
+    def __repr__(self):
+        return f"TopPorts({self.count})"
+
+def parse_top_ports(ports_str, proto="tcp"):
+    """Renvoie un TopPorts si la chaîne est de la forme "top100" / "top:100", sinon None."""
+    match = TOP_PORTS_PATTERN.match(ports_str.strip())
+    return TopPorts(int(match.group(1)), proto) if match else None
+
+def _services_file_path():
+    if sys.platform.startswith('win'):
+        return os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), "System32", "drivers", "etc", "services")
+    return "/etc/services"
+
+@functools.lru_cache(maxsize=None)
+def load_service_table():
+    """
+    Charge une seule fois le fichier services du système en mémoire : {"tcp": {port: nom}, "udp": {...}}.
+    Comme getservbyport, la première entrée d'un port l'emporte.
+    """
+    table = {"tcp": {}, "udp": {}}
+    try:
+        with open(_services_file_path(), 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                fields = line.split('#', 1)[0].split()
+                if len(fields) < 2 or '/' not in fields[1]:
+                    continue
+                port, proto = fields[1].split('/', 1)
+                if proto in table and port.isdigit():
+                    table[proto].setdefault(int(port), fields[0])
+    except OSError:
+        pass # Pas de fichier services : on se rabattra sur getservbyport
+    return table
+
+@functools.lru_cache(maxsize=4096)
+def _getservbyport(port, proto):
+    try:
+        return socket.getservbyport(port, proto)
+    except OSError:
+        return "unknown"
+
+def service_name(port, proto="tcp"):
+    """Nom du service associé à un port, sans relire le fichier services à chaque appel."""
+    table = load_service_table()[proto]
+    if table:
+        return table.get(port, "unknown")
+    return _getservbyport(port, proto)
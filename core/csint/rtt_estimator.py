@@ -0,0 +1,88 @@
+# SXTOOLS PREMIUM/core/csint/rtt_estimator.py
+import random
+import statistics
+
+# Bornes des timeouts de connexion dérivés du RTT (en secondes)
+INITIAL_TIMEOUT = 1.0 # Avant toute mesure (comme le RTO initial de TCP), sauf si RttTracker en fixe un autre
+MIN_TIMEOUT = 0.1
+MAX_TIMEOUT = 5.0
+RESERVOIR_SIZE = 10000 # Nombre max d'échantillons gardés pour la distribution
+
+class RttEstimator:
+    """Estimation lissée du RTT d'une cible, à la manière de TCP (SRTT/RTTVAR, RFC 6298)."""
+    __slots__ = ("srtt", "rttvar")
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self):
+        self.srtt = None
+        self.rttvar = None
+
+    def add_sample(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+
+    def timeout(self, initial=INITIAL_TIMEOUT):
+        if self.srtt is None:
+            return initial
+        rto = self.srtt + self.K * self.rttvar
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, rto))
+
+class RttTracker:
+    """
+    Regroupe les estimateurs par cible et la distribution globale des RTT observés.
+    Seules les cibles qui ont répondu ont un estimateur ; les autres utilisent l'estimation globale.
+    `initial_timeout` sert tant qu'aucune mesure n'existe.
+    """
+    def __init__(self, initial_timeout=INITIAL_TIMEOUT):
+        self.initial_timeout = initial_timeout
+        self.targets = {}
+        self.global_estimator = RttEstimator()
+        self.count = 0
+        self.min_rtt = None
+        self.max_rtt = None
+        self.retransmissions = 0
+        self._reservoir = []
+
+    def add_sample(self, target_ip, rtt):
+        self.targets.setdefault(target_ip, RttEstimator()).add_sample(rtt)
+        self.global_estimator.add_sample(rtt)
+        self.count += 1
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+        self.max_rtt = rtt if self.max_rtt is None else max(self.max_rtt, rtt)
+        # Échantillonnage par réservoir : distribution représentative en mémoire bornée
+        if len(self._reservoir) < RESERVOIR_SIZE:
+            self._reservoir.append(rtt)
+        else:
+            slot = random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self._reservoir[slot] = rtt
+
+    def timeout_for(self, target_ip, attempt=0):
+        """Timeout de connexion pour une cible, doublé à chaque retransmission (backoff exponentiel)."""
+        estimator = self.targets.get(target_ip, self.global_estimator)
+        return min(MAX_TIMEOUT, estimator.timeout(self.initial_timeout) * (2 ** attempt))
+
+    def srtt_for(self, target_ip):
+        estimator = self.targets.get(target_ip)
+        return estimator.srtt if estimator else None
+
+    def summary(self):
+        """Résumé texte de la distribution des RTT (en ms)."""
+        if not self.count:
+            return f"RTT: no samples (retransmissions: {self.retransmissions})"
+        samples = sorted(self._reservoir)
+        if len(samples) >= 2:
+            percentiles = statistics.quantiles(samples, n=100, method='inclusive')
+            p50, p90, p99 = percentiles[49], percentiles[89], percentiles[98]
+        else:
+            p50 = p90 = p99 = samples[0]
+        return (f"RTT (ms): samples={self.count} min={self.min_rtt * 1000:.1f} p50={p50 * 1000:.1f} "
+                f"p90={p90 * 1000:.1f} p99={p99 * 1000:.1f} max={self.max_rtt * 1000:.1f} "
+                f"| retransmissions: {self.retransmissions}")
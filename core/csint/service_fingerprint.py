@@ -0,0 +1,165 @@
+# SXTOOLS PREMIUM/core/csint/service_fingerprint.py
+import asyncio
+import functools
+import re
+import ssl
+from utils.logger import app_logger
+
+MAX_BANNER_BYTES = 1024 # Lecture bornée : on ne garde que le début de la réponse
+BANNER_WAIT = 0.5 # Attente d'une bannière spontanée (SSH, FTP, SMTP...) avant d'envoyer une sonde
+BANNER_TIMEOUT = 3.0
+FINGERPRINT_CONCURRENCY = 50
+
+HTTP_PROBE = b"HEAD / HTTP/1.0\r\nUser-Agent: SXTOOLS PREMIUM Scanner/1.0\r\n\r\n"
+
+# Ports où le client parle en premier : la sonde part immédiatement, sans attendre de bannière.
+# Pour les autres, la même sonde HTTP sert de repli si le serveur reste muet : elle fait aussi
+# réagir Redis, memcached, RTSP ou TLS, ce qui suffit à les reconnaître.
+CLIENT_FIRST_PROBES = {port: HTTP_PROBE for port in (80, 81, 443, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8443, 8888, 9000, 9200)}
+
+# Table de signatures : (service, motif, gabarit de version). Compilée une seule fois à l'import ;
+# la première signature qui correspond l'emporte, les plus spécifiques sont donc en tête.
+_RAW_SIGNATURES = [
+    ("ssh", rb"^SSH-([\d.]+)-([^\r\n]+)", "{1} (protocol {0})"),
+    ("smtp", rb"^220[- ]([^\r\n]*(?:SMTP|Postfix|Exim|Sendmail)[^\r\n]*)", "{0}"),
+    ("ftp", rb"^220[- ]([^\r\n]*(?:FTP|FileZilla|ProFTPD|Pure-FTPd|vsFTPd)[^\r\n]*)", "{0}"),
+    ("ftp/smtp", rb"^220[- ]([^\r\n]*)", "{0}"),
+    ("pop3", rb"^\+OK([^\r\n]*)", "{0}"),
+    ("imap", rb"^\* (?:OK|PREAUTH)([^\r\n]*)", "{0}"),
+    ("http", rb"^HTTP/(\d\.\d) (\d{3})(?:.*?\r\nServer: ([^\r\n]+))?", "{2}"),
+    ("rtsp", rb"^RTSP/(\d\.\d) (\d{3})(?:.*?\r\nServer: ([^\r\n]+))?", "{2}"),
+    ("sip", rb"^SIP/2\.0 (\d{3})(?:.*?\r\nServer: ([^\r\n]+))?", "{1}"),
+    ("mysql", rb"^.\x00\x00\x00\x0a([0-9][\w.\-~+]*)\x00", "{0}"),
+    ("vnc", rb"^RFB (\d{3}\.\d{3})", "protocol {0}"),
+    ("redis", rb"^-(?:ERR|NOAUTH|DENIED)[^\r\n]*", ""),
+    ("memcached", rb"^(?:ERROR|CLIENT_ERROR)\r\n", ""),
+    ("amqp", rb"^AMQP", ""),
+    ("xmpp", rb"<stream:stream", ""),
+    ("telnet", rb"^\xff[\xfb-\xfe]", ""),
+    ("ssl/tls", rb"^\x15\x03[\x00-\x04]", ""), # Alerte TLS en réponse à du texte clair
+]
+SERVICE_SIGNATURES = [(name, re.compile(pattern, re.DOTALL), template) for name, pattern, template in _RAW_SIGNATURES]
+
+def identify_service(data):
+    """Rapproche une bannière de la table de signatures. Renvoie (service, détail) ou None."""
+    if not data:
+        return None
+    for name, regex, template in SERVICE_SIGNATURES:
+        match = regex.search(data)
+        if match:
+            groups = [(g or b"").decode('latin-1').strip() for g in match.groups()]
+            return name, template.format(*groups).strip() if groups else ""
+    # Inconnu : on garde la première ligne lisible comme indice
+    first_line = data.split(b"\n", 1)[0].decode('latin-1', errors='replace')
+    printable = "".join(c for c in first_line if c.isprintable()).strip()
+    return ("unknown", printable[:60]) if printable else None
+
+async def _read_bounded(reader, timeout):
+    try:
+        return await asyncio.wait_for(reader.read(MAX_BANNER_BYTES), timeout)
+    except (asyncio.TimeoutError, OSError):
+        return b""
+
+@functools.lru_cache(maxsize=None)
+def _client_hello():
+    """ClientHello TLS générique en octets bruts, produit une seule fois par le module ssl (sans connexion)."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    outgoing = ssl.MemoryBIO()
+    tls = context.wrap_bio(ssl.MemoryBIO(), outgoing)
+    try:
+        tls.do_handshake()
+    except ssl.SSLWantReadError:
+        pass # Attend la réponse du serveur : le ClientHello est prêt dans `outgoing`
+    return outgoing.read()
+
+def _may_be_tls(banner, identified):
+    """
+    Réponse qui n'exclut pas TLS : rien, rien de reconnu, ou un HTTP 400 (nginx et consorts répondent ainsi
+    à du texte clair sur un port TLS, d'autres serveurs ferment la connexion sans rien envoyer).
+    """
+    if identified is None or identified[0] == "unknown":
+        return True
+    return identified[0] == "http" and re.match(rb"^HTTP/\d\.\d 400", banner) is not None
+
+async def detect_tls(target_ip, port, timeout=BANNER_TIMEOUT):
+    """Envoie un ClientHello : le port parle TLS si la réponse est un enregistrement TLS (handshake 0x16 ou alerte 0x15)."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(target_ip, port), timeout)
+    except (asyncio.TimeoutError, OSError):
+        return False
+    try:
+        writer.write(_client_hello())
+        await writer.drain()
+        data = await _read_bounded(reader, timeout)
+        return data[:1] in (b"\x15", b"\x16") and data[1:2] == b"\x03"
+    except OSError:
+        return False
+    finally:
+        writer.close()
+
+async def grab_banner(target_ip, port, timeout=BANNER_TIMEOUT):
+    """Lit une bannière bornée ; envoie au plus une petite sonde. Renvoie les octets reçus (éventuellement vides)."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(target_ip, port), timeout)
+    except (asyncio.TimeoutError, OSError):
+        return b""
+    try:
+        probe = CLIENT_FIRST_PROBES.get(port)
+        data = b""
+        if probe is None:
+            data = await _read_bounded(reader, BANNER_WAIT)
+            probe = None if data else HTTP_PROBE
+        if probe is not None:
+            writer.write(probe)
+            await writer.drain()
+            data = await _read_bounded(reader, timeout)
+        return data
+    except OSError:
+        return b""
+    finally:
+        writer.close()
+
+class Fingerprinter:
+    """
+    Second étage du pipeline de scan : chaque port ouvert est soumis dès sa découverte et identifié
+    en parallèle pendant que le scan continue. Les résultats sont dans `results[(ip, port)] = (service, détail)`.
+    Un port reconnu comme TLS est transmis à `tls_harvester` (tls_certs.CertHarvester) s'il est fourni ;
+    quand la réponse au texte clair ne tranche pas (voir _may_be_tls), un ClientHello vérifie si le port parle TLS.
+    """
+    def __init__(self, concurrency=FINGERPRINT_CONCURRENCY, timeout=BANNER_TIMEOUT, progress=None, tls_harvester=None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.progress = progress
+        self.tls_harvester = tls_harvester
+        self.results = {}
+        self._tasks = set()
+        self._semaphore = None
+
+    def submit(self, target_ip, port):
+        """À appeler depuis la boucle asyncio du scan."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        task = asyncio.get_running_loop().create_task(self._fingerprint(target_ip, port))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fingerprint(self, target_ip, port):
+        async with self._semaphore:
+            banner = await grab_banner(target_ip, port, self.timeout)
+            identified = identify_service(banner)
+            if _may_be_tls(banner, identified) and await detect_tls(target_ip, port, self.timeout):
+                identified = ("ssl/tls", identified[1] if identified and identified[0] == "http" else "")
+        if identified:
+            self.results[(target_ip, port)] = identified
+            app_logger.info(f"Service on {target_ip}:{port}: {identified[0]} {identified[1]}")
+            if self.progress:
+                self.progress.result(f"{target_ip}:{port} -> {identified[0]} {identified[1]}".rstrip())
+            if identified[0] == "ssl/tls" and self.tls_harvester:
+                self.tls_harvester.submit(target_ip, port)
+
+    async def drain(self):
+        """Attend la fin des identifications encore en cours (fin du scan)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
@@ -1,41 +1,255 @@
 import requests
+import requests.adapters
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue
 from utils.logger import app_logger
+from utils.checkpoint import Checkpoint, default_checkpoint_path, load_checkpoint
+from utils.rate_limiter import Pacer
+from utils.wordlist import estimate_words, iter_wordlist
+from core.csint.tls_certs import discovered_hostnames
+from core.csint.dns_batch import DNS_BATCH_SIZE, detect_wildcard, make_resolver, resolve_names
+from core.csint.passive_index import PASSIVE_INDEX_PATH, passive_names
+from core.csint.http_fingerprint import describe, fingerprint_url, format_clusters
+from core.csint.subdomain_permutations import MAX_PERMUTATIONS, PERMUTATION_DEPTH, PERMUTATION_WORDS, PermutationExpander
+from urllib.parse import urlparse
+import itertools
 import os
 
-NUM_THREADS_SUBDOMAIN = 10
-sub_q = Queue()
+NUM_THREADS_SUBDOMAIN = 30 # Concurrence max, la concurrence effective est adaptée par le Pacer
+INITIAL_CONCURRENCY_SUBDOMAIN = 10
+SUBDOMAIN_RATE_LIMIT = None # Requêtes/s max vers le domaine cible (None = pas de limite)
+SUBDOMAIN_QUEUE_SIZE = 2000 # File bornée : la résolution DNS attend quand les sondes HTTP prennent du retard
 
-def check_subdomain(subdomain, domain, found_subdomains_list):
-    target_url_http = f"http://{subdomain}.{domain}"
-    target_url_https = f"https://{subdomain}.{domain}"
-    
-    for url_to_check in [target_url_http, target_url_https]:
+PROBE_TIMEOUT = 3
+PROBE_HEADERS = {'User-Agent': 'SXTOOLS PREMIUMSubdomainFinder/1.0'}
+
+def make_session(pool_size=NUM_THREADS_SUBDOMAIN):
+    """Session keep-alive partagée par les workers ; un pool de connexions par hôte, dimensionné sur leur nombre."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size * 2, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(PROBE_HEADERS)
+    return session
+
+def probe_url(url, http=requests):
+    """
+    Requête légère : HEAD d'abord ; si le serveur refuse HEAD (405/501), GET en flux refermé dès
+    les en-têtes reçus. Le corps n'est jamais téléchargé. `http` est une Session ou le module requests.
+    """
+    response = http.head(url, timeout=PROBE_TIMEOUT, allow_redirects=False, headers=PROBE_HEADERS)
+    if response.status_code in (405, 501):
+        response = http.get(url, timeout=PROBE_TIMEOUT, allow_redirects=False, headers=PROBE_HEADERS, stream=True)
+        response.close()
+    return response
+
+def _response_fingerprint(response, hostname):
+    """Empreinte d'en-têtes d'une réponse, indépendante du nom demandé (comparaison avec la référence wildcard)."""
+    location = response.headers.get('Location', '').replace(hostname, '{host}')
+    return (urlparse(response.url).scheme, response.status_code, location,
+            response.headers.get('Content-Type', '').split(';')[0].strip().lower(), response.headers.get('Server', ''))
+
+class WildcardBaseline:
+    """
+    Référence d'un domaine wildcard, relevée sur des labels aléatoires : adresses DNS et empreintes
+    des réponses HTTP. Un candidat qui y correspond est écarté dès la résolution DNS, ou à la lecture des en-têtes
+    si le wildcard renvoie des adresses tournantes (CDN).
+    """
+    def __init__(self, domain, addresses, sample_names, http=requests):
+        self.domain = domain
+        self.addresses = set(addresses)
+        self.responses = set()
+        for hostname in sample_names:
+            for scheme in ("http", "https"):
+                try:
+                    # Même requête que pour les candidats, pour que les empreintes soient comparables
+                    self.responses.add(_response_fingerprint(probe_url(f"{scheme}://{hostname}", http), hostname))
+                except requests.exceptions.RequestException:
+                    pass
+        self.filtered = 0
+
+    def matches_dns(self, addresses):
+        return bool(addresses) and set(addresses) <= self.addresses
+
+    def matches_response(self, response, hostname):
+        return _response_fingerprint(response, hostname) in self.responses
+
+def _probe_scheme(url, hostname, http, wildcard):
+    """Sonde une URL. Renvoie (statut si le sous-domaine répond, outcome pour le Pacer)."""
+    try:
+        response = probe_url(url, http)
+    except requests.exceptions.ConnectionError:
+        return None, None # Ne peut pas se connecter, probablement n'existe pas
+    except requests.exceptions.Timeout:
+        app_logger.warning(f"Timeout checking {url}")
+        return None, False
+    except requests.exceptions.RequestException as e:
+        app_logger.debug(f"Request exception for {url}: {e}")
+        return None, None
+    if response.status_code in (429, 503):
+        app_logger.warning(f"Rate limited while checking {url} (Status: {response.status_code})")
+        return None, False
+    if wildcard and wildcard.matches_response(response, hostname):
+        wildcard.filtered += 1
+        app_logger.debug(f"{url} matches the wildcard baseline, ignored")
+        return None, True
+    # On considère un succès si ce n'est pas une page d'erreur (4xx/5xx) : 2xx, 3xx
+    return (response.status_code if response.status_code < 400 else None), True
+
+def _record_checks(hostname, urls, checks, found_subdomains_list, progress, http, fingerprints):
+    """
+    Enregistre le résultat des sondes HTTP puis HTTPS d'un nom ([(statut, outcome)], voir _probe_scheme).
+    Renvoie l'outcome pour le Pacer : True si le serveur a répondu normalement, False en cas de timeout
+    ou de limitation (429/503), None sinon. Si `fingerprints` (dict) est fourni, l'empreinte HTTP
+    du sous-domaine trouvé y est rangée par URL.
+    """
+    for url, (status, _) in zip(urls, checks):
+        if status:
+            app_logger.info(f"Found potential subdomain: {url} (Status: {status})")
+            found_subdomains_list.append(url) # HTTP en priorité, comme avant
+            fingerprint = fingerprint_url(url, hostname, http, PROBE_HEADERS) if fingerprints is not None else None
+            if fingerprint:
+                fingerprints[url] = fingerprint
+            if progress:
+                progress.result(f"{url} {describe(fingerprint)}" if fingerprint else url)
+            break
+    outcomes = [outcome for _, outcome in checks if outcome is not None]
+    if False in outcomes:
+        return False
+    return True if outcomes else None
+
+
+class SubdomainScanner:
+    """
+    Sondes HTTP/HTTPS d'une recherche de sous-domaines. Chaque instance a sa propre file (bornée), son
+    répartiteur, ses résultats (`found`, `fingerprints`) et sa cadence : plusieurs recherches peuvent tourner
+    en même temps sans se voler de travail. Les sondes sont des tâches courtes soumises à un pool de threads,
+    privé ou partagé entre scans (`pool`, utils.worker_pool.ScanPool) : aucun thread n'attend une autre tâche
+    du pool, un pool partagé ne peut donc pas se bloquer lui-même.
+    Utilisation : start(), puis submit(index, label) pour chaque nom résolu, puis close() qui attend la fin.
+    """
+    def __init__(self, domain, found=None, progress=None, checkpoint=None, pacer=None, wildcard=None, session=None,
+                 fingerprints=None, pool=None, queue_size=SUBDOMAIN_QUEUE_SIZE):
+        self.domain = domain
+        self.found = found if found is not None else []
+        self.progress = progress
+        self.checkpoint = checkpoint
+        self.pacer = pacer
+        self.wildcard = wildcard
+        self.session = session or requests
+        self.fingerprints = fingerprints
+        self.pool = pool
+        self.queue = Queue(maxsize=queue_size)
+        self._executor = None
+        self._dispatcher = None
+        self._outstanding = 0
+        self._idle = threading.Condition()
+
+    def start(self):
+        if self.pool is None:
+            # Deux sondes par nom (HTTP et HTTPS en parallèle), au plus NUM_THREADS_SUBDOMAIN noms en vol
+            self._executor = ThreadPoolExecutor(max_workers=NUM_THREADS_SUBDOMAIN * 2, thread_name_prefix="subdomain")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, index, label):
+        """Ajoute un nom résolu à sonder ; bloque si la file est pleine (contre-pression sur la résolution DNS)."""
+        self.queue.put((index, label))
+
+    def close(self):
+        """Signale la fin des noms et attend que toutes les sondes soient terminées."""
+        self.queue.put(None)
+        self._dispatcher.join()
+        with self._idle:
+            self._idle.wait_for(lambda: self._outstanding == 0)
+        if self._executor:
+            self._executor.shutdown()
+
+    def _submit_task(self, fn, *args):
+        return self.pool.submit(fn, *args) if self.pool else self._executor.submit(fn, *args)
+
+    def _dispatch_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None: # Fin de la résolution DNS : plus rien à sonder
+                return
+            index, label = item
+            if self.checkpoint and index is not None: # Les permutations (index None) ne sont pas suivies
+                self.checkpoint.begin(index)
+            if self.pacer:
+                self.pacer.acquire(self.domain) # Le nombre de noms en vol suit la concurrence du Pacer
+            with self._idle:
+                self._outstanding += 1
+            self._probe(index, label)
+
+    def _probe(self, index, label):
+        hostname = f"{label}.{self.domain}"
+        urls = [f"http://{hostname}", f"https://{hostname}"]
+        futures = [self._submit_task(_probe_scheme, url, hostname, self.session, self.wildcard) for url in urls]
+        pending = [len(futures)]
+        lock = threading.Lock()
+
+        def probe_done(_):
+            with lock:
+                pending[0] -= 1
+                if pending[0]:
+                    return
+            # Dernière sonde terminée (dans le thread qui l'a exécutée) : on conclut pour ce nom
+            checks = [(None, None) if future.exception() else future.result() for future in futures]
+            self._finish(index, hostname, urls, checks)
+
+        for future in futures:
+            future.add_done_callback(probe_done)
+
+    def _finish(self, index, hostname, urls, checks):
+        outcome = None
         try:
-            response = requests.get(url_to_check, timeout=3, allow_redirects=False, headers={'User-Agent': 'SXTOOLS PREMIUMSubdomainFinder/1.0'})
-            # On considère un succès si ce n'est pas une redirection vers la page principale
-            # ou une page d'erreur standard (404). Certains serveurs renvoient 200 pour des sous-domaines inexistants (wildcard DNS).
-            # C'est une heuristique simple. Un vrai outil ferait plus d'analyses.
-            if response.status_code < 400 : # 2xx, 3xx
-                app_logger.info(f"Found potential subdomain: {url_to_check} (Status: {response.status_code})")
-                found_subdomains_list.append(url_to_check)
-                return # Trouvé, pas besoin de vérifier l'autre protocole
-        except requests.exceptions.ConnectionError:
-            pass # Ne peut pas se connecter, probablement n'existe pas
-        except requests.exceptions.Timeout:
-            app_logger.warning(f"Timeout checking {url_to_check}")
-        except requests.exceptions.RequestException as e:
-            app_logger.debug(f"Request exception for {url_to_check}: {e}")
-
-
-def subdomain_worker(domain, found_subdomains_list):
-    while not sub_q.empty():
-        sub = sub_q.get()
-        check_subdomain(sub, domain, found_subdomains_list)
-        sub_q.task_done()
-
-def find_subdomains(domain, wordlist_path="wordlists/subdomains_common.txt"):
+            outcome = _record_checks(hostname, urls, checks, self.found, self.progress, self.session, self.fingerprints)
+        except Exception as e:
+            app_logger.error(f"Failed to record probes for {hostname}: {e}", exc_info=True)
+        finally:
+            if self.pacer:
+                self.pacer.release(outcome)
+            if self.progress:
+                self.progress.advance()
+            if self.checkpoint and index is not None:
+                self.checkpoint.finish(index)
+            with self._idle:
+                self._outstanding -= 1
+                self._idle.notify_all()
+
+def find_subdomains(domain, wordlist_path="wordlists/subdomains_common.txt", progress=None, checkpoint_path=None,
+                    start_offset=0, previous_found=None, pacer=None, extra_candidates=None, detect_wildcards=True,
+                    dedup=False, permutation_depth=PERMUTATION_DEPTH, previous_discovered=None, use_passive_index=True,
+                    passive_only=False, fingerprint_http=True, pool=None, cert_names=None,
+                    passive_index_path=PASSIVE_INDEX_PATH):
+    """
+    Recherche des sous-domaines à partir d'une wordlist, lue en flux : la mémoire ne dépend pas de sa taille.
+    `dedup=True` saute les doublons de la wordlist (filtre de Bloom, voir utils.wordlist).
+    Les candidats sont d'abord résolus en DNS par lots (dns_batch) ; seuls les noms qui existent
+    sont sondés en HTTP/HTTPS, pendant que le lot suivant se résout.
+    Avec `detect_wildcards`, des labels aléatoires sont d'abord résolus : si le domaine répond à tout (wildcard DNS),
+    les candidats qui renvoient les mêmes adresses ou les mêmes réponses sont écartés.
+    `progress` (utils.progress.ProgressReporter) reçoit l'avancement et les sous-domaines trouvés au fil de l'eau.
+    L'avancement est sauvegardé périodiquement dans `checkpoint_path` (par défaut sous checkpoints/),
+    voir resume_subdomains pour reprendre une recherche interrompue.
+    `pacer` (utils.rate_limiter.Pacer) cadence les requêtes ; par défaut la concurrence s'adapte aux timeouts.
+    `extra_candidates` : noms d'hôte complets à tester en plus de la wordlist ; par défaut, ceux relevés
+    dans les certificats TLS collectés par le port scanner (tls_certs.discovered_hostnames), ou `cert_names`
+    s'il est fourni (reprise), suivis de ceux de l'index passif. Le checkpoint n'enregistre que ces entrées
+    (noms des certificats, chemin de l'index) et la liste est reconstruite, dans le même ordre, à la reprise.
+    Après la wordlist, les noms résolus servent de base à des permutations (web1 -> web2, api -> dev-api,
+    api x mots de la wordlist, v2.api...) sur `permutation_depth` générations (voir subdomain_permutations).
+    Avec `use_passive_index`, les noms déjà connus dans l'index passif local (passive_index) sont sondés en tête ;
+    `passive_only=True` se contente de les lister, sans aucune requête réseau.
+    `fingerprint_http` relève titre, Server, X-Powered-By, redirection et hash de chaque page trouvée (lecture
+    bornée, voir http_fingerprint) ; les pages identiques (parkings, pages par défaut) sont regroupées sur une ligne.
+    Les sondes passent par un SubdomainScanner propre à cet appel ; `pool` (utils.worker_pool.ScanPool) les
+    exécute sur un pool de threads partagé avec les autres scans en cours.
+    """
+    if passive_only:
+        return passive_lookup(domain)
     app_logger.info(f"Starting subdomain search for {domain} using wordlist {wordlist_path}")
     if not domain:
         return "Error: Domain cannot be empty."
@@ -45,41 +259,207 @@ def find_subdomains(domain, wordlist_path="wordlists/subdomains_common.txt"):
         return f"Error: Wordlist not found at '{wordlist_path}'."
 
     try:
-        with open(wordlist_path, 'r') as f:
-            wordlist = [line.strip() for line in f if line.strip()]
-    except Exception as e:
+        estimated_words = estimate_words(wordlist_path) # Extrapolée du premier bloc, sans lire toute la liste
+    except OSError as e:
         app_logger.error(f"Error reading wordlist {wordlist_path}: {e}")
         return f"Error reading wordlist: {e}"
 
-    if not wordlist:
+    if not estimated_words:
         return "Error: Wordlist is empty or could not be read."
 
-    app_logger.info(f"Loaded {len(wordlist)} subdomains from wordlist.")
+    app_logger.info(f"Streaming ~{estimated_words} subdomains from wordlist.")
+
+    explicit_candidates = extra_candidates is not None
+    if not explicit_candidates:
+        if cert_names is None:
+            cert_names = sorted(discovered_hostnames(domain))
+        extra_candidates = list(cert_names)
+        if use_passive_index:
+            try:
+                extra_candidates += passive_names(domain, passive_index_path)
+            except (OSError, ValueError) as e: # Index absent ou abîmé : la recherche active continue sans lui
+                app_logger.warning(f"Cannot read passive index, continuing without it: {e}")
+    suffix = "." + domain.lower()
+    extra_labels = {} # dict : dédoublonnage en temps constant, dans l'ordre d'arrivée
+    for hostname in extra_candidates:
+        hostname = hostname.lower().rstrip('.')
+        label = hostname[:-len(suffix)] if hostname.endswith(suffix) else None
+        if label:
+            extra_labels[label] = None
+    extra_labels = list(extra_labels)
+    if extra_labels:
+        app_logger.info(f"Added {len(extra_labels)} candidates from TLS certificates and the passive index.")
+
+    # Les candidats issus des certificats passent en tête (index 0..n-1), la wordlist est numérotée à leur suite :
+    # ils sont enregistrés dans le checkpoint, les positions restent donc valables à la reprise.
+    wordlist_offset = max(0, start_offset - len(extra_labels))
+    candidates = itertools.chain(
+        itertools.islice(enumerate(extra_labels), start_offset, None),
+        ((index + len(extra_labels), word)
+         for index, word in iter_wordlist(wordlist_path, wordlist_offset, dedup, capacity=estimated_words)))
+
+    if progress:
+        progress.set_total(estimated_words + len(extra_labels))
+        progress.advance(start_offset)
+
+    permutation_words = [word for _, word in itertools.islice(iter_wordlist(wordlist_path), PERMUTATION_WORDS)]
+    # Seuls les noms résolus vont dans le filtre des permutations : sa taille ne dépend pas de la wordlist
+    expander = PermutationExpander(permutation_words, permutation_depth)
+    discovered = list(previous_discovered or []) # Noms résolus pendant la wordlist, base des permutations
+    for label in discovered:
+        expander.mark_seen(label)
+        expander.add_found(label)
+
+    found_subdomains = list(previous_found or [])
+    fingerprints = {} if fingerprint_http else None
+    if checkpoint_path is None:
+        checkpoint_path = default_checkpoint_path("subdomains", f"{domain}_{os.path.basename(wordlist_path)}")
+
+    def checkpoint_state():
+        state = {
+            "kind": "subdomains", "domain": domain, "wordlist_path": wordlist_path, "found": list(found_subdomains),
+            "dedup": dedup, "permutation_depth": permutation_depth, "discovered": list(discovered),
+        }
+        if explicit_candidates:
+            state["extra_candidates"] = list(extra_candidates)
+        else: # L'index passif peut compter des centaines de milliers de noms : il est relu à la reprise
+            state.update(cert_names=list(cert_names), use_passive_index=use_passive_index,
+                         passive_index_path=passive_index_path)
+        return state
+    checkpoint = Checkpoint(checkpoint_path, checkpoint_state, start_offset=start_offset)
+
+    if pacer is None:
+        pacer = Pacer(NUM_THREADS_SUBDOMAIN, min_concurrency=2, initial_concurrency=INITIAL_CONCURRENCY_SUBDOMAIN,
+                      per_target_rate=SUBDOMAIN_RATE_LIMIT)
+
+    # Connexions réutilisées entre les sondes (HTTP et HTTPS d'un même nom partent en même temps)
+    session = make_session(NUM_THREADS_SUBDOMAIN)
 
-    for sub in wordlist:
-        sub_q.put(sub)
+    resolver = make_resolver()
+    wildcard = None
+    if detect_wildcards:
+        wildcard_addresses, wildcard_names = detect_wildcard(domain, resolver)
+        if wildcard_addresses:
+            app_logger.warning(f"Wildcard DNS detected for *.{domain}: {sorted(wildcard_addresses)}")
+            wildcard = WildcardBaseline(domain, wildcard_addresses, wildcard_names, session)
 
-    found_subdomains = []
-    threads = []
-    for _ in range(min(NUM_THREADS_SUBDOMAIN, len(wordlist))):
-        t = threading.Thread(target=subdomain_worker, args=(domain, found_subdomains), daemon=True)
-        threads.append(t)
-        t.start()
+    scanner = SubdomainScanner(domain, found_subdomains, progress, checkpoint, pacer, wildcard, session, fingerprints, pool)
+    scanner.start()
 
-    sub_q.join()
+    # Chaque entrée est numérotée par sa position dans la wordlist pour le checkpoint.
+    # Un nom reste "en cours" jusqu'à sa sonde HTTP, ou jusqu'à sa résolution s'il n'existe pas.
+    resolved_count = dns_errors = checked_count = permutations_resolved = 0
+    streamed = 0 # Entrées de la wordlist (et candidats en tête) lues pendant cette exécution
+    wordlist_done = False
+    while True:
+        # Wordlist d'abord (génération 0), puis les permutations des noms résolus, génération par génération
+        batch = [(index, sub, 0) for index, sub in itertools.islice(candidates, DNS_BATCH_SIZE)] if not wordlist_done else []
+        streamed += len(batch)
+        if batch:
+            for index, sub, _ in batch:
+                checkpoint.begin(index)
+        else:
+            if not wordlist_done:
+                wordlist_done = True
+                if progress: # Fin du flux : le total estimé devient le compte exact
+                    progress.set_total(start_offset + streamed)
+            batch = [(None, sub, depth) for sub, depth in expander.take(DNS_BATCH_SIZE)]
+            if not batch:
+                break
+            if progress:
+                progress.set_total(progress.total + len(batch))
+        checked_count += len(batch)
+        answers = resolve_names([f"{sub}.{domain}" for _, sub, _ in batch], resolver)
+        for (index, sub, depth), (addresses, error) in zip(batch, answers):
+            if addresses:
+                resolved_count += 1
+                if index is not None and permutation_depth:
+                    expander.mark_seen(sub) # Les permutations ne reproposeront pas un nom déjà résolu
+                if wildcard and wildcard.matches_dns(addresses):
+                    wildcard.filtered += 1 # Même réponse qu'un nom inexistant : inutile de sonder en HTTP
+                else:
+                    if index is None:
+                        permutations_resolved += 1
+                    else:
+                        discovered.append(sub)
+                    expander.add_found(sub, depth)
+                    scanner.submit(index, sub) # Bloque si la file est pleine (contre-pression)
+                    continue
+            if error:
+                dns_errors += 1
+            if progress:
+                progress.advance()
+            if index is not None:
+                checkpoint.finish(index)
+    app_logger.info(f"DNS resolution for {domain}: {resolved_count} of {checked_count} names resolved, "
+                    f"{dns_errors} errors.")
+    scanner.close()
+    session.close()
+    checkpoint.complete()
+    if progress:
+        progress.flush()
 
     result_str = f"Subdomain Scan Results for {domain}:\n"
     result_str += "----------------------------------------\n"
     if found_subdomains:
-        for f_sub in sorted(list(set(found_subdomains))): # set pour dédupliquer
+        if fingerprints:
+            for line in format_clusters(fingerprints.values()):
+                result_str += f"{line}\n"
+        for f_sub in sorted(list(set(found_subdomains) - set(fingerprints or ()))): # set pour dédupliquer
             result_str += f"{f_sub}\n"
         app_logger.info(f"Found {len(found_subdomains)} potential subdomains for {domain}.")
     else:
         result_str += "No subdomains found with the given wordlist.\n"
         app_logger.info(f"No subdomains found for {domain} with wordlist {wordlist_path}.")
+    result_str += f"\nDNS: {resolved_count}/{checked_count} candidates resolved"
+    result_str += f" ({dns_errors} lookup errors).\n" if dns_errors else ".\n"
+    if expander.generated:
+        result_str += (f"Permutations: {expander.generated} candidate(s) generated from discovered names "
+                       f"(depth {permutation_depth}), {permutations_resolved} resolved.\n")
+        if expander.generated >= MAX_PERMUTATIONS:
+            result_str += f"Permutation budget of {MAX_PERMUTATIONS} candidates reached.\n"
+    if wildcard:
+        result_str += (f"Wildcard DNS detected for *.{domain} ({', '.join(sorted(wildcard.addresses))}): "
+                       f"{wildcard.filtered} candidate(s) matching the wildcard were ignored.\n")
     
     return result_str
 
+def passive_lookup(domain):
+    """Noms connus sous `domain` dans l'index passif local, sans requête réseau."""
+    app_logger.info(f"Passive subdomain lookup for {domain}")
+    if not domain:
+        return "Error: Domain cannot be empty."
+    try:
+        names = passive_names(domain)
+    except OSError as e:
+        app_logger.error(f"Cannot read passive index: {e}")
+        return f"Error reading passive index: {e}"
+    result_str = f"Known Subdomains for {domain} (passive index):\n"
+    result_str += "----------------------------------------\n"
+    if names:
+        result_str += "\n".join(names) + f"\n\n{len(names)} name(s) found offline.\n"
+    else:
+        result_str += "No known subdomains in the passive index (import sources with core.csint.passive_index).\n"
+    return result_str
+
+def resume_subdomains(checkpoint_path, progress=None, pool=None):
+    """Reprend une recherche de sous-domaines interrompue à partir de son checkpoint."""
+    try:
+        data = load_checkpoint(checkpoint_path)
+    except ValueError as e:
+        app_logger.error(str(e))
+        return f"Error: {e}"
+    if data.get("kind") != "subdomains":
+        return f"Error: {checkpoint_path} is not a subdomain scan checkpoint."
+    app_logger.info(f"Resuming subdomain search from {checkpoint_path} at offset {data['offset']}")
+    return find_subdomains(data["domain"], data["wordlist_path"], progress=progress, checkpoint_path=checkpoint_path,
+                           start_offset=data["offset"], previous_found=data.get("found", []),
+                           extra_candidates=data.get("extra_candidates"), dedup=data.get("dedup", False),
+                           permutation_depth=data.get("permutation_depth", PERMUTATION_DEPTH),
+                           previous_discovered=data.get("discovered", []), pool=pool,
+                           cert_names=data.get("cert_names", []), use_passive_index=data.get("use_passive_index", False),
+                           passive_index_path=data.get("passive_index_path", PASSIVE_INDEX_PATH))
+
 if __name__ == '__main__':
     test_domain = "google.com" # Un domaine avec beaucoup de sous-domaines connus
     # Créez un petit wordlists/subdomains_common.txt pour tester:
@@ -0,0 +1,97 @@
+# SXTOOLS PREMIUM/core/csint/subdomain_permutations.py
+import re
+from collections import deque
+from utils.bloom import BloomFilter
+
+PERMUTATION_DEPTH = 2 # Générations de permutations à partir des noms trouvés (0 = désactivé)
+MAX_PERMUTATIONS = 100000 # Budget total de candidats générés, quelle que soit la profondeur
+PERMUTATION_WORDS = 50 # Mots de tête de la wordlist combinés avec les labels trouvés
+NUMBER_SPAN = 3 # web1 -> web0 .. web4
+
+ENVIRONMENT_WORDS = ("dev", "test", "qa", "uat", "stage", "staging", "preprod", "prod", "beta", "demo", "sandbox", "int")
+
+_NUMBER_PATTERN = re.compile(r"(\d+)(?!.*\d)") # Dernier groupe de chiffres du label
+
+def numeric_variants(label):
+    """web1 -> web0, web2...; api -> api1, api2. La largeur des nombres est conservée (web01 -> web02)."""
+    match = _NUMBER_PATTERN.search(label)
+    if not match:
+        return [f"{label}{n}" for n in range(1, NUMBER_SPAN)]
+    number, width = int(match.group(1)), len(match.group(1))
+    variants = []
+    for n in range(max(0, number - NUMBER_SPAN), number + NUMBER_SPAN + 1):
+        if n != number:
+            variants.append(f"{label[:match.start()]}{n:0{width}d}{label[match.end():]}")
+    return variants
+
+def environment_variants(label):
+    """dev-api -> staging-api, prod-api...; api -> dev-api, api-dev..."""
+    tokens = re.split(r"([-.])", label)
+    variants = []
+    for position, token in enumerate(tokens):
+        if token in ENVIRONMENT_WORDS:
+            for env in ENVIRONMENT_WORDS:
+                if env != token:
+                    variants.append("".join(tokens[:position] + [env] + tokens[position + 1:]))
+    if not variants:
+        for env in ENVIRONMENT_WORDS:
+            variants.extend((f"{env}-{label}", f"{label}-{env}"))
+    return variants
+
+def word_variants(label, words):
+    """Label trouvé x mots de la wordlist : api-v2, v2-api, et v2.api (récursion dans le sous-domaine)."""
+    for word in words:
+        yield f"{label}-{word}"
+        yield f"{word}-{label}"
+        yield f"{word}.{label}"
+
+def iter_permutations(label, words):
+    yield from numeric_variants(label)
+    yield from environment_variants(label)
+    yield from word_variants(label, words)
+
+class PermutationExpander:
+    """
+    Générateur paresseux de candidats à partir des noms trouvés. Les noms découverts par une génération
+    alimentent la suivante jusqu'à `max_depth`. Un filtre de Bloom retient les candidats déjà proposés et
+    les noms résolus déclarés par mark_seen : un nom n'est jamais proposé deux fois. Il est dimensionné sur le
+    budget plus `seen_capacity` noms résolus (par défaut autant que le budget), jamais sur la taille de la
+    wordlist : un mot de la wordlist qui n'a pas résolu peut être reproposé, au prix d'une requête DNS.
+    """
+    def __init__(self, words, max_depth=PERMUTATION_DEPTH, budget=MAX_PERMUTATIONS, seen_capacity=None):
+        self.words = list(words)
+        self.max_depth = max_depth
+        self.budget = budget
+        self.seen = BloomFilter(budget + (budget if seen_capacity is None else seen_capacity))
+        self.generated = 0
+        self._pending = deque()
+        self._current = None
+
+    def mark_seen(self, label):
+        """Déclare un nom résolu (déjà sondé). Renvoie True s'il ne l'était pas encore."""
+        return self.seen.add(label)
+
+    def add_found(self, label, depth=0):
+        """Nom résolu à la génération `depth` : ses permutations seront proposées si la profondeur le permet."""
+        if depth < self.max_depth:
+            self._pending.append((label, depth + 1))
+
+    def take(self, count):
+        """Jusqu'à `count` nouveaux candidats (label, génération) ; liste vide quand il n'y a plus rien à proposer."""
+        batch = []
+        while len(batch) < count and self.generated < self.budget:
+            if self._current is None:
+                if not self._pending:
+                    break
+                label, depth = self._pending.popleft()
+                self._current = (iter_permutations(label, self.words), depth)
+            variants, depth = self._current
+            for candidate in variants:
+                if self.seen.add(candidate):
+                    batch.append((candidate, depth))
+                    self.generated += 1
+                    if len(batch) >= count or self.generated >= self.budget:
+                        break
+            else:
+                self._current = None # Label épuisé, on passe au suivant
+        return batch
@@ -0,0 +1,123 @@
+# SXTOOLS PREMIUM/core/csint/target_parser.py
+import ipaddress
+import os
+import socket
+from utils.logger import app_logger
+
+def _split_entries(text):
+    """Découpe une chaîne en entrées (séparateurs: virgules, espaces, retours à la ligne; '#' = commentaire)."""
+    for line in text.splitlines():
+        line = line.split('#', 1)[0]
+        for entry in line.replace(',', ' ').split():
+            yield entry
+
+def _parse_entry(entry):
+    """Transforme une entrée en (réseau, libellé). Les plages CIDR ne sont jamais développées ici."""
+    if '/' in entry:
+        try:
+            return ipaddress.ip_network(entry, strict=False), entry
+        except ValueError:
+            raise ValueError(f"Invalid CIDR block: {entry}")
+    try:
+        return ipaddress.ip_network(entry), entry # Adresse IP seule -> réseau /32 ou /128
+    except ValueError:
+        pass
+    try:
+        target_ip = socket.gethostbyname(entry)
+    except socket.gaierror:
+        app_logger.error(f"Cannot resolve hostname: {entry}")
+        raise ValueError(f"Cannot resolve hostname '{entry}'")
+    return ipaddress.ip_network(target_ip), entry
+
+def parse_target_spec(targets):
+    """
+    Parse une spécification de cibles : chaîne ("10.0.0.1, 192.168.1.0/24 example.com"),
+    liste de chaînes, ou fichier référencé par '@chemin/cibles.txt' (une ou plusieurs cibles par ligne).
+    Renvoie une liste de sources (réseau, libellé) ; les adresses ne sont développées qu'à l'itération.
+    """
+    if isinstance(targets, str):
+        targets = [targets]
+
+    sources = []
+    for item in targets:
+        for entry in _split_entries(str(item)):
+            if entry.startswith('@'):
+                path = entry[1:]
+                if not os.path.exists(path):
+                    raise ValueError(f"Target file not found: {path}")
+                with open(path, 'r') as f:
+                    for line in f:
+                        sources.extend(_parse_entry(e) for e in _split_entries(line))
+            else:
+                sources.append(_parse_entry(entry))
+    return sources
+
+def parse_scope(scope_entries):
+    """Parse la liste blanche de périmètre (adresses ou blocs CIDR autorisés)."""
+    if isinstance(scope_entries, str):
+        scope_entries = list(_split_entries(scope_entries))
+    scope = []
+    for entry in scope_entries or []:
+        try:
+            scope.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            raise ValueError(f"Invalid scope entry: {entry}")
+    return scope
+
+def apply_scope(sources, scope):
+    """
+    Confronte les sources au périmètre autorisé. Renvoie (sources_gardées, libellés_rejetés).
+    Chaque source gardée devient (réseau, libellé, parent) : parent vaut None si le réseau est entièrement
+    dans le périmètre. Un réseau seulement en partie dans le périmètre est remplacé par ses intersections
+    exactes avec celui-ci (les blocs autorisés qu'il contient), dont `parent` garde le réseau d'origine :
+    on n'itère et ne compte donc que les adresses réellement scannées.
+    Une liste blanche vide n'impose aucune restriction.
+    """
+    kept, skipped = [], []
+    for network, label in sources:
+        if not scope:
+            kept.append((network, label, None))
+            continue
+        same_family = [s for s in scope if s.version == network.version]
+        if any(network.subnet_of(s) for s in same_family):
+            kept.append((network, label, None))
+            continue
+        # Deux blocs CIDR qui se recoupent sont inclus l'un dans l'autre : ici, le bloc autorisé est dans la cible
+        inside = list(ipaddress.collapse_addresses(s for s in same_family if s.subnet_of(network)))
+        if inside:
+            app_logger.warning(f"Target {label} is only partially in scope, only {len(inside)} in-scope block(s) will be scanned.")
+            for block in inside:
+                block_label = str(block.network_address) if block.num_addresses == 1 else str(block)
+                kept.append((block, block_label, network))
+        else:
+            app_logger.warning(f"Target {label} is out of scope, skipping.")
+            skipped.append(label)
+    return kept, skipped
+
+def _reserved_addresses(network):
+    """Adresses que network.hosts() ne renvoie pas (réseau et broadcast en IPv4, anycast de sous-réseau en IPv6)."""
+    if network.num_addresses <= 2:
+        return ()
+    if network.version == 4:
+        return (network.network_address, network.broadcast_address)
+    return (network.network_address,)
+
+def iter_hosts(sources):
+    """Itère paresseusement les adresses (str) des sources filtrées par apply_scope."""
+    for network, _, parent in sources:
+        if parent is None:
+            hosts = network.hosts() if network.num_addresses > 1 else iter([network.network_address])
+        else:
+            # Bloc découpé dans une cible plus large : mêmes adresses que si la cible entière était filtrée
+            reserved = _reserved_addresses(parent)
+            hosts = (ip for ip in network if ip not in reserved)
+        for ip in hosts:
+            yield str(ip)
+
+def count_hosts(sources):
+    """Nombre exact d'adresses couvertes par les sources (celles que iter_hosts produit)."""
+    total = 0
+    for network, _, parent in sources:
+        reserved = _reserved_addresses(network if parent is None else parent)
+        total += network.num_addresses - sum(1 for ip in reserved if ip in network)
+    return total
@@ -0,0 +1,233 @@
+# SXTOOLS PREMIUM/core/csint/tls_certs.py
+import asyncio
+import hashlib
+import ssl
+import threading
+from collections import OrderedDict
+from utils.logger import app_logger
+
+TLS_PORTS = {443, 465, 563, 636, 853, 989, 990, 992, 993, 994, 995, 4443, 5061, 6697, 8443, 9443, 10443}
+TLS_TIMEOUT = 5.0
+TLS_CONCURRENCY = 50
+CERT_CACHE_SIZE = 4096
+
+# Cache des certificats déjà analysés, par empreinte SHA-256 (partagé entre les scans du processus)
+_cert_cache = OrderedDict()
+# Noms d'hôte vus dans tous les certificats analysés, conservés même après éviction du cache
+_discovered_names = set()
+_cert_lock = threading.Lock()
+
+# OIDs utiles (encodage DER du contenu)
+_OID_COMMON_NAME = b"\x55\x04\x03"
+_OID_SUBJECT_ALT_NAME = b"\x55\x1d\x11"
+
+def _der_element(data, offset):
+    """Lit un élément DER à `offset`. Renvoie (tag, début_valeur, fin_valeur)."""
+    tag = data[offset]
+    length = data[offset + 1]
+    offset += 2
+    if length & 0x80: # Longueur en forme longue
+        num_bytes = length & 0x7f
+        length = int.from_bytes(data[offset:offset + num_bytes], 'big')
+        offset += num_bytes
+    return tag, offset, offset + length
+
+def _der_children(data, start, end):
+    while start < end:
+        tag, value_start, value_end = _der_element(data, start)
+        yield tag, value_start, value_end
+        start = value_end
+
+def _name_common_names(data, start, end):
+    # Name ::= SEQUENCE OF SET OF SEQUENCE { OID, valeur }
+    names = []
+    for _, set_start, set_end in _der_children(data, start, end):
+        for _, attr_start, attr_end in _der_children(data, set_start, set_end):
+            attr = list(_der_children(data, attr_start, attr_end))
+            if len(attr) == 2 and data[attr[0][1]:attr[0][2]] == _OID_COMMON_NAME:
+                names.append(data[attr[1][1]:attr[1][2]].decode('utf-8', errors='replace'))
+    return names
+
+def _decode_time(raw, tag):
+    text = raw.decode('ascii', errors='replace')
+    if tag == 0x17: # UTCTime : AAMMJJhhmmssZ
+        year = int(text[:2])
+        text = ("19" if year >= 50 else "20") + text
+    return f"{text[0:4]}-{text[4:6]}-{text[6:8]}"
+
+def parse_certificate(der):
+    """
+    Extrait d'un certificat X.509 (DER) : CN du sujet, CN de l'émetteur, noms DNS du SAN et date d'expiration.
+    Lecteur ASN.1 minimal : pas de dépendance externe et pas de vérification de signature (inutile ici).
+    """
+    _, cert_start, cert_end = _der_element(der, 0)
+    _, tbs_start, tbs_end = _der_element(der, cert_start)
+    fields = list(_der_children(der, tbs_start, tbs_end))
+    if fields and fields[0][0] == 0xa0: # Version explicite [0], absente en v1
+        fields = fields[1:]
+    # serialNumber, signature, issuer, validity, subject, subjectPublicKeyInfo, ..., [3] extensions
+    issuer, validity, subject = fields[2], fields[3], fields[4]
+    info = {
+        "subject_cn": _name_common_names(der, subject[1], subject[2]),
+        "issuer_cn": _name_common_names(der, issuer[1], issuer[2]),
+        "san": [],
+        "not_after": None,
+    }
+    validity_times = list(_der_children(der, validity[1], validity[2]))
+    if len(validity_times) == 2:
+        tag, start, end = validity_times[1]
+        info["not_after"] = _decode_time(der[start:end], tag)
+    for tag, start, end in fields[5:]:
+        if tag != 0xa3:
+            continue
+        _, ext_seq_start, ext_seq_end = _der_element(der, start)
+        for _, ext_start, ext_end in _der_children(der, ext_seq_start, ext_seq_end):
+            parts = list(_der_children(der, ext_start, ext_end))
+            if der[parts[0][1]:parts[0][2]] != _OID_SUBJECT_ALT_NAME:
+                continue
+            _, octet_start, octet_end = parts[-1] # extnValue (après un éventuel booléen "critical")
+            _, names_start, names_end = _der_element(der, octet_start)
+            for name_tag, name_start, name_end in _der_children(der, names_start, names_end):
+                if name_tag == 0x82: # dNSName [2]
+                    info["san"].append(der[name_start:name_end].decode('ascii', errors='replace'))
+    return info
+
+def _ssl_context():
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE # On collecte le certificat, on ne le valide pas
+    try:
+        context.minimum_version = ssl.TLSVersion.TLSv1
+        context.set_ciphers("ALL:@SECLEVEL=0") # Accepter aussi les vieux serveurs
+    except (ValueError, ssl.SSLError):
+        pass
+    return context
+
+async def fetch_certificate(target_ip, port, timeout=TLS_TIMEOUT, server_name=None, context=None):
+    """Effectue la poignée de main TLS et renvoie le certificat du serveur en DER (ou None)."""
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(target_ip, port, ssl=context or _ssl_context(), server_hostname=server_name),
+            timeout)
+    except (asyncio.TimeoutError, OSError, ssl.SSLError):
+        return None
+    try:
+        ssl_object = writer.get_extra_info('ssl_object')
+        return ssl_object.getpeercert(binary_form=True) if ssl_object else None
+    finally:
+        writer.close()
+
+def certificate_info(der):
+    """
+    Analyse un certificat en passant par le cache d'empreintes. Renvoie (empreinte, infos).
+    Ses noms d'hôte sont ajoutés à _discovered_names, qui survit à l'éviction du cache.
+    """
+    fingerprint = hashlib.sha256(der).hexdigest()
+    with _cert_lock:
+        info = _cert_cache.get(fingerprint)
+        if info is not None:
+            _cert_cache.move_to_end(fingerprint)
+            return fingerprint, info
+    try:
+        info = parse_certificate(der)
+    except (IndexError, ValueError) as e:
+        app_logger.warning(f"Could not parse certificate {fingerprint[:16]}: {e}")
+        info = {"subject_cn": [], "issuer_cn": [], "san": [], "not_after": None}
+    with _cert_lock:
+        _cert_cache[fingerprint] = info
+        if len(_cert_cache) > CERT_CACHE_SIZE:
+            _cert_cache.popitem(last=False)
+        _discovered_names.update(_cert_hostnames(info))
+    return fingerprint, info
+
+def _cert_hostnames(info):
+    for name in info["subject_cn"] + info["san"]:
+        name = name.strip().lower().rstrip('.')
+        if name.startswith("*."):
+            name = name[2:]
+        if name and ' ' not in name and '.' in name:
+            yield name
+
+def discovered_hostnames(domain=None):
+    """Noms d'hôte vus dans les certificats collectés (optionnellement limités à un domaine)."""
+    with _cert_lock: # Copie : les scans en cours (boucle partagée ou autres threads) continuent d'en ajouter
+        names = set(_discovered_names)
+    if domain:
+        domain = domain.lower().rstrip('.')
+        names = {n for n in names if n == domain or n.endswith("." + domain)}
+    return names
+
+class CertHarvester:
+    """
+    Étage de pipeline : poignée de main TLS sur les ports TLS ouverts, en parallèle du scan.
+    `endpoints[(ip, port)]` donne l'empreinte du certificat, `certs[empreinte]` ses infos.
+    Les noms trouvés alimentent discovered_hostnames(), utilisé par subdomain_finder.
+    `server_names` ({ip: nom}) fournit le SNI à présenter pour les cibles connues par leur nom.
+    """
+    def __init__(self, concurrency=TLS_CONCURRENCY, timeout=TLS_TIMEOUT, progress=None, server_names=None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.progress = progress
+        self.server_names = server_names or {}
+        self.endpoints = {}
+        self.certs = {}
+        self._tasks = set()
+        self._semaphore = None
+        self._context = None
+
+    def submit(self, target_ip, port):
+        """À appeler depuis la boucle asyncio du scan."""
+        if (target_ip, port) in self.endpoints:
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._context = _ssl_context()
+        self.endpoints[(target_ip, port)] = None
+        task = asyncio.get_running_loop().create_task(self._harvest(target_ip, port))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _harvest(self, target_ip, port):
+        async with self._semaphore:
+            der = await fetch_certificate(target_ip, port, self.timeout, self.server_names.get(target_ip), self._context)
+        if der is None:
+            del self.endpoints[(target_ip, port)]
+            return
+        fingerprint, info = certificate_info(der)
+        self.endpoints[(target_ip, port)] = fingerprint
+        self.certs[fingerprint] = info
+        names = sorted(set(_cert_hostnames(info)))
+        app_logger.info(f"TLS certificate on {target_ip}:{port}: {fingerprint[:16]} {names}")
+        if self.progress:
+            self.progress.result(f"{target_ip}:{port} -> TLS cert {', '.join(names) or fingerprint[:16]}")
+
+    async def drain(self):
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def hostnames(self):
+        names = set()
+        for info in self.certs.values():
+            names.update(_cert_hostnames(info))
+        return names
+
+    def summary(self):
+        """Un bloc par certificat distinct, avec les points d'accès qui le présentent."""
+        if not self.certs:
+            return ""
+        by_cert = {}
+        for endpoint, fingerprint in self.endpoints.items():
+            if fingerprint:
+                by_cert.setdefault(fingerprint, []).append(f"{endpoint[0]}:{endpoint[1]}")
+        lines = [f"\nTLS Certificates ({len(self.certs)} unique):"]
+        for fingerprint, endpoints in by_cert.items():
+            info = self.certs[fingerprint]
+            lines.append(f"  SHA256 {fingerprint[:16]}... CN={', '.join(info['subject_cn']) or '-'} "
+                         f"Issuer={', '.join(info['issuer_cn']) or '-'} Expires={info['not_after'] or '-'}")
+            if info["san"]:
+                lines.append(f"    SAN: {', '.join(info['san'])}")
+            lines.append(f"    Seen on: {', '.join(sorted(endpoints))}")
+        names = self.hostnames()
+        if names:
+            lines.append(f"Hostnames discovered: {len(names)} (added as Subdomain Finder candidates)")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,126 @@
+# SXTOOLS PREMIUM/core/csint/udp_probes.py
+import asyncio
+import socket
+import struct
+from utils.logger import app_logger
+
+def _ber(tag, payload):
+    """Encode un élément BER (longueurs courtes uniquement, suffisant pour nos sondes)."""
+    return bytes([tag, len(payload)]) + payload
+
+def _dns_query(qname_labels, qtype, qclass=1):
+    header = struct.pack(">HHHHHH", 0x5358, 0x0100, 1, 0, 0, 0) # id "SX", récursion demandée, 1 question
+    qname = b"".join(bytes([len(label)]) + label for label in qname_labels) + b"\x00"
+    return header + qname + struct.pack(">HH", qtype, qclass)
+
+# Requête DNS NS pour la racine "." : tout serveur DNS répond, même non récursif
+DNS_QUERY = _dns_query([], 2)
+
+# Requête NTP client (LI=0, VN=3, Mode=3), 48 octets
+NTP_REQUEST = b"\x1b" + b"\x00" * 47
+
+# Requête NetBIOS "node status" pour le nom générique "*"
+NETBIOS_STATUS_REQUEST = (struct.pack(">HHHHHH", 0x5358, 0x0000, 1, 0, 0, 0)
+                          + b"\x20CKAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA\x00" + struct.pack(">HH", 0x21, 1))
+
+# SNMPv1 GetRequest sysDescr.0 avec la communauté "public"
+SNMP_GET_SYSDESCR = _ber(0x30,
+    _ber(0x02, b"\x00")                                   # version: SNMPv1
+    + _ber(0x04, b"public")                               # communauté
+    + _ber(0xa0,                                          # GetRequest-PDU
+        _ber(0x02, b"\x53\x58\x00\x01")                   # request-id
+        + _ber(0x02, b"\x00") + _ber(0x02, b"\x00")       # error-status, error-index
+        + _ber(0x30, _ber(0x30, _ber(0x06, b"\x2b\x06\x01\x02\x01\x01\x01\x00") + b"\x05\x00"))))
+
+# Découverte SSDP/UPnP
+SSDP_MSEARCH = (b"M-SEARCH * HTTP/1.1\r\n"
+                b"HOST: 239.255.255.250:1900\r\n"
+                b"MAN: \"ssdp:discover\"\r\n"
+                b"MX: 1\r\n"
+                b"ST: ssdp:all\r\n\r\n")
+
+# Énumération des services mDNS (_services._dns-sd._udp.local PTR)
+MDNS_SERVICES_QUERY = _dns_query([b"_services", b"_dns-sd", b"_udp", b"local"], 12)
+
+# Lecture TFTP d'un fichier improbable : un serveur répond par une erreur, ce qui suffit
+TFTP_READ_REQUEST = b"\x00\x01" + b"sxtools-probe\x00octet\x00"
+
+# Sonde générique des ports sans charge utile dédiée : asyncio ignore l'envoi d'un datagramme vide
+# (sendto(b"") n'émet rien), il faut donc au moins un octet
+GENERIC_PAYLOAD = b"\r\n"
+
+# Charge utile par port ; les autres ports reçoivent GENERIC_PAYLOAD
+UDP_PAYLOADS = {
+    53: DNS_QUERY,
+    69: TFTP_READ_REQUEST,
+    123: NTP_REQUEST,
+    137: NETBIOS_STATUS_REQUEST,
+    161: SNMP_GET_SYSDESCR,
+    1900: SSDP_MSEARCH,
+    5353: MDNS_SERVICES_QUERY,
+}
+
+class _UdpProbeProtocol(asyncio.DatagramProtocol):
+    """Associe chaque réponse à la sonde en attente pour (ip, port) source."""
+    def __init__(self):
+        self.pending = {}
+
+    def datagram_received(self, data, addr):
+        future = self.pending.pop((addr[0], addr[1]), None)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc):
+        # Sans socket connecté, un ICMP "port unreachable" ne peut pas être rattaché à une sonde
+        app_logger.debug(f"UDP socket error: {exc}")
+
+class UdpProber:
+    """
+    Sondes UDP asynchrones sur un seul socket par famille d'adresses (IPv4/IPv6), partagé par
+    toutes les sondes en vol : les réponses sont rapprochées des sondes par adresse et port source.
+    Un port qui répond est "open" ; sans réponse il est "filtered" (ouvert ou filtré, indiscernable).
+    """
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = None
+
+    async def _endpoint(self, family):
+        if family in self._endpoints:
+            return self._endpoints[family]
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock: # Une seule ouverture même si mille sondes arrivent en même temps
+            if family not in self._endpoints:
+                loop = asyncio.get_running_loop()
+                local_addr = ('::', 0) if family == socket.AF_INET6 else ('0.0.0.0', 0)
+                self._endpoints[family] = await loop.create_datagram_endpoint(_UdpProbeProtocol, local_addr=local_addr)
+        return self._endpoints[family]
+
+    async def probe(self, target_ip, port, timeout):
+        """Même contrat que les sondes TCP : renvoie (état, rtt)."""
+        family = socket.AF_INET6 if ':' in target_ip else socket.AF_INET
+        try:
+            transport, protocol = await self._endpoint(family)
+        except OSError as e:
+            app_logger.error(f"Cannot open UDP socket: {e}")
+            return "error", None
+        loop = asyncio.get_running_loop()
+        key = (target_ip, port)
+        future = loop.create_future()
+        protocol.pending[key] = future
+        start = loop.time()
+        try:
+            transport.sendto(UDP_PAYLOADS.get(port, GENERIC_PAYLOAD), key)
+            await asyncio.wait_for(future, timeout)
+            return "open", loop.time() - start
+        except asyncio.TimeoutError:
+            return "filtered", None
+        except OSError:
+            return "error", None
+        finally:
+            protocol.pending.pop(key, None)
+
+    def close(self):
+        for transport, _ in self._endpoints.values():
+            transport.close()
+        self._endpoints.clear()
@@ -1,27 +1,42 @@
 import re
 import hashlib
+import asyncio
+import json
+import os
+import aiohttp
 import requests
 from utils.logger import app_logger
+from utils.wordlist import estimate_words
+from utils.worker_pool import run_coroutine
+from core.csint.dns_batch import DNS_CONCURRENCY, make_resolver, resolve_name
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}') # Compilé une fois, utilisé avec fullmatch
+GRAVATAR_URL = "https://www.gravatar.com/avatar"
+GRAVATAR_CONCURRENCY = 100 # Sondes Gravatar en vol (un seul hôte : le pool de connexions est dimensionné dessus)
+GRAVATAR_TIMEOUT = 5
+EMAIL_CHUNK_SIZE = 5000 # Adresses lues, analysées puis écrites ensemble : la mémoire ne dépend pas du fichier
+MAIL_RDTYPES = ("MX", "A", "AAAA") # Sans MX, un domaine reçoit le courrier sur son adresse (RFC 5321)
 
 def is_valid_email_format(email):
     """Vérifie le format de base d'un email."""
-    regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.fullmatch(regex, email))
+    return EMAIL_PATTERN.fullmatch(email) is not None
+
+def gravatar_hash(email):
+    return hashlib.md5(email.lower().strip().encode('utf-8')).hexdigest()
 
-def get_gravatar_url(email):
-    """Tente de récupérer l'URL Gravatar si publique."""
-    email_lower = email.lower().strip()
-    hash_obj = hashlib.md5(email_lower.encode('utf-8')).hexdigest()
-    gravatar_url = f"https://www.gravatar.com/avatar/{hash_obj}?d=404" # d=404 renvoie 404 si pas d'avatar
+def get_gravatar_url(email, http=requests):
+    """Tente de récupérer l'URL Gravatar si publique. `http` est une Session ou le module requests."""
+    hash_obj = gravatar_hash(email)
+    gravatar_url = f"{GRAVATAR_URL}/{hash_obj}?d=404" # d=404 renvoie 404 si pas d'avatar
 
     try:
-        response = requests.head(gravatar_url, timeout=5, allow_redirects=True) # HEAD pour ne pas dl l'image
+        response = http.head(gravatar_url, timeout=GRAVATAR_TIMEOUT, allow_redirects=True) # HEAD pour ne pas dl l'image
         if response.status_code == 200:
             # Check content type to be sure it's an image and not a redirect to a placeholder service
             content_type = response.headers.get('Content-Type', '')
             if 'image' in content_type:
                  # Construct the URL that would typically be used to display the image
-                return f"https://www.gravatar.com/avatar/{hash_obj}"
+                return f"{GRAVATAR_URL}/{hash_obj}"
             else: # It might be a gravatar redirect to a placeholder or non-image
                 return "Gravatar exists but might be a placeholder or redirect."
         elif response.status_code == 404:
@@ -65,6 +80,149 @@ def analyze_email(email):
     app_logger.info(f"Email analysis complete for: {email}")
     return results
 
+async def probe_gravatar(session, email):
+    """Version asynchrone de get_gravatar_url pour l'analyse groupée. Renvoie (url ou None, statut)."""
+    hash_obj = gravatar_hash(email)
+    try:
+        async with session.head(f"{GRAVATAR_URL}/{hash_obj}?d=404", allow_redirects=True) as response:
+            if response.status == 200 and 'image' in response.headers.get('Content-Type', ''):
+                return f"{GRAVATAR_URL}/{hash_obj}", "found"
+            if response.status == 404:
+                return None, "absent"
+            return None, f"status {response.status}"
+    except asyncio.TimeoutError:
+        return None, "error: timeout"
+    except aiohttp.ClientError as e:
+        app_logger.debug(f"Gravatar check failed for {email}: {e}")
+        return None, f"error: {e}"
+
+async def _check_domains(domains, resolver, domain_cache):
+    """Résout les domaines pas encore vus (MX, sinon A/AAAA) ; chaque domaine n'est interrogé qu'une fois par analyse."""
+    semaphore = asyncio.Semaphore(DNS_CONCURRENCY)
+
+    async def check(domain):
+        async with semaphore:
+            hosts, error = await resolve_name(resolver, domain, MAIL_RDTYPES)
+        accepts_mail = bool(hosts) and hosts != ["0 ."] # "0 ." = MX nul : le domaine refuse tout courrier
+        domain_cache[domain] = {"mail_hosts": hosts, "accepts_mail": accepts_mail, "dns_error": error}
+
+    await asyncio.gather(*(check(domain) for domain in domains if domain not in domain_cache))
+
+async def _analyze_chunk(emails, session, resolver, domain_cache, progress):
+    by_domain = {}
+    records = []
+    for email in emails:
+        if not is_valid_email_format(email):
+            records.append({"email": email, "valid": False})
+            continue
+        username, domain = email.rsplit('@', 1)
+        record = {"email": email, "valid": True, "username": username, "domain": domain.lower()}
+        by_domain.setdefault(record["domain"], []).append(record)
+        records.append(record)
+
+    # Le temps passé à attendre une connexion libre compte dans le timeout total d'aiohttp : les sondes
+    # n'entrent qu'à GRAVATAR_CONCURRENCY à la fois, pour que le timeout ne mesure que la requête elle-même
+    semaphore = asyncio.Semaphore(GRAVATAR_CONCURRENCY)
+
+    async def gravatar(record):
+        async with semaphore:
+            record["gravatar"], record["gravatar_status"] = await probe_gravatar(session, record["email"])
+        if progress and record["gravatar"]:
+            progress.result(f"{record['email']}: {record['gravatar']}")
+
+    tasks = []
+    if resolver is not None:
+        tasks.append(_check_domains(by_domain, resolver, domain_cache))
+    if session is not None:
+        tasks.extend(gravatar(record) for group in by_domain.values() for record in group)
+    await asyncio.gather(*tasks)
+    if resolver is not None:
+        for domain, group in by_domain.items():
+            for record in group:
+                record.update(domain_cache[domain])
+    if progress:
+        progress.advance(len(emails))
+    return records
+
+def _iter_chunks(path, size):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        chunk = []
+        for line in f:
+            email = line.strip()
+            if email and not email.startswith('#'):
+                chunk.append(email)
+                if len(chunk) >= size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+async def _analyze_file_async(input_path, output, check_gravatar, check_domains, progress, stats):
+    domain_cache = {}
+    resolver = make_resolver() if check_domains else None
+    session = None
+    if check_gravatar:
+        # Toutes les sondes visent le même hôte : connexions keep-alive partagées, plafonnées par la concurrence
+        connector = aiohttp.TCPConnector(limit=GRAVATAR_CONCURRENCY, limit_per_host=GRAVATAR_CONCURRENCY)
+        session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=GRAVATAR_TIMEOUT))
+    try:
+        for chunk in _iter_chunks(input_path, EMAIL_CHUNK_SIZE):
+            records = await _analyze_chunk(chunk, session, resolver, domain_cache, progress)
+            output.writelines(json.dumps(record) + "\n" for record in records)
+            stats["emails"] += len(records)
+            stats["valid"] += sum(1 for record in records if record["valid"])
+            stats["gravatars"] += sum(1 for record in records if record.get("gravatar"))
+    finally:
+        if session is not None:
+            await session.close()
+    stats["domains"] = len(domain_cache)
+    stats["mail_domains"] = sum(1 for info in domain_cache.values() if info["accepts_mail"])
+
+def analyze_email_file(input_path, output_path=None, progress=None, check_gravatar=True, check_domains=True, pool=None):
+    """
+    Analyse groupée d'un fichier d'adresses (une par ligne), lu en flux par blocs de EMAIL_CHUNK_SIZE.
+    Dans chaque bloc, le format est validé (EMAIL_PATTERN), les adresses sont regroupées par domaine et
+    chaque nouveau domaine est vérifié une seule fois en DNS (MX, sinon A/AAAA) ; les sondes Gravatar partent
+    en parallèle sur une session aiohttp partagée. Une ligne JSON par adresse est écrite dans `output_path`
+    (par défaut <fichier>_analysis.jsonl) au fil de l'eau.
+    `progress` (utils.progress.ProgressReporter) reçoit l'avancement et les Gravatar trouvés.
+    `pool` (utils.worker_pool.ScanPool) fait tourner l'analyse sur la boucle asyncio partagée entre scans.
+    """
+    input_path = (input_path or "").strip()
+    if input_path.startswith("@"): # Même syntaxe que les listes de cibles
+        input_path = input_path[1:]
+    app_logger.info(f"Starting bulk email analysis of {input_path}")
+    if not input_path:
+        return "Error: Email list file cannot be empty."
+    if not os.path.exists(input_path):
+        return f"Error: Email list not found at '{input_path}'."
+    if output_path is None:
+        output_path = os.path.splitext(input_path)[0] + "_analysis.jsonl"
+    if progress:
+        progress.set_total(estimate_words(input_path))
+
+    stats = {"emails": 0, "valid": 0, "gravatars": 0, "domains": 0, "mail_domains": 0}
+    try:
+        with open(output_path, 'w', encoding='utf-8') as output:
+            run_coroutine(_analyze_file_async(input_path, output, check_gravatar, check_domains, progress, stats), pool)
+    except OSError as e:
+        app_logger.error(f"Bulk email analysis failed: {e}")
+        return f"Error during bulk email analysis: {e}"
+    if progress:
+        progress.set_total(stats["emails"]) # Le total de départ n'était qu'une estimation (estimate_words)
+        progress.flush()
+
+    results = f"Bulk Email Analysis for: {input_path}\n"
+    results += "----------------------------------------\n"
+    results += f"Addresses: {stats['emails']} ({stats['valid']} valid format)\n"
+    if check_domains:
+        results += f"Domains: {stats['domains']} checked once each, {stats['mail_domains']} accept mail\n"
+    if check_gravatar:
+        results += f"Public Gravatars: {stats['gravatars']}\n"
+    results += f"Results written to {output_path} (one JSON object per address).\n"
+    app_logger.info(f"Bulk email analysis complete: {stats}")
+    return results
+
 if __name__ == '__main__':
     test_email_valid = "test@example.com"
     test_email_gravatar = "beau@wordpress.com" # Un email avec un Gravatar connu
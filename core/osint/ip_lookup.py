@@ -1,27 +1,365 @@
 import requests
 import json
+import dbm
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+import maxminddb
 from utils.logger import app_logger
+from core.osint.ip_ranges import OWNERS_FILE, RANGE_INDEX_PATH, RangeIndex
 
-def lookup_ip(ip_address):
+IP_API_URL = "http://ip-api.com" # Remplaçable par un serveur local de test (même API /json et /batch)
+IP_API_FIELDS = "status,message,query,country,countryCode,regionName,city,zip,lat,lon,timezone,isp,org,as"
+IP_API_BATCH_SIZE = 100 # Maximum accepté par /batch
+IP_API_TIMEOUT = 10
+CACHE_PATH = os.path.join("data", "ip_cache")
+CACHE_TTL = 24 * 3600 # Secondes avant qu'une réponse en cache soit redemandée
+MEMORY_CACHE_SIZE = 10000
+GEOIP_DATABASES = [ # Bases au format MaxMind (GeoLite2/GeoIP2, DB-IP...) : toutes celles présentes sont consultées
+    os.path.join("data", "GeoLite2-City.mmdb"),
+    os.path.join("data", "GeoLite2-ASN.mmdb"),
+]
+DISPLAY_FIELDS = ['country', 'countryCode', 'regionName', 'city', 'zip', 'lat', 'lon', 'timezone', 'isp', 'org', 'as']
+
+class LookupCache:
+    """
+    Cache des réponses ip-api à deux niveaux : un LRU en mémoire devant une base clé/valeur sur disque (dbm),
+    qui survit aux redémarrages. Chaque entrée est horodatée et ignorée au-delà de `ttl` secondes.
+    Seules les réponses de l'API sont mises en cache, jamais les erreurs réseau.
+    """
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_entries=MEMORY_CACHE_SIZE):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._db = None
+        self._lock = threading.Lock()
+
+    def _disk(self):
+        if self._db is None and self.path:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            try:
+                self._db = dbm.open(self.path, 'c')
+            except OSError as e:
+                app_logger.error(f"Cannot open IP lookup cache {self.path}: {e}")
+                self.path = None # Cache disque désactivé, le LRU mémoire reste actif
+        return self._db
+
+    def _remember(self, ip, entry):
+        self._memory[ip] = entry
+        self._memory.move_to_end(ip)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, ip):
+        """Réponse en cache pour `ip`, ou None si absente ou expirée."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(ip)
+            if entry is not None:
+                self._memory.move_to_end(ip)
+            else:
+                db = self._disk()
+                raw = db.get(ip.encode('utf-8')) if db is not None else None
+                if raw is None:
+                    return None
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    return None
+                self._remember(ip, entry)
+            if now - entry["time"] > self.ttl:
+                return None
+            return entry["data"]
+
+    def put(self, ip, data):
+        entry = {"time": time.time(), "data": data}
+        with self._lock:
+            self._remember(ip, entry)
+            db = self._disk()
+            if db is not None:
+                db[ip.encode('utf-8')] = json.dumps(entry)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+@functools.lru_cache(maxsize=8)
+def _open_database(path, mtime):
+    # MODE_AUTO : extension C ou lecteur Python, les deux sur le fichier projeté en mémoire (mmap) ;
+    # la base n'est jamais chargée en RAM, le système ne lit que les pages touchées par les recherches
+    return maxminddb.open_database(path, maxminddb.MODE_AUTO)
+
+def offline_databases(paths=None):
+    """Lecteurs des bases MMDB disponibles (ouverts une fois, rouverts si le fichier change)."""
+    readers = []
+    for path in (paths if paths is not None else GEOIP_DATABASES):
+        if not os.path.exists(path):
+            continue
+        try:
+            readers.append(_open_database(path, os.path.getmtime(path)))
+        except (OSError, maxminddb.InvalidDatabaseError) as e:
+            app_logger.error(f"Cannot open GeoIP database {path}: {e}")
+    return readers
+
+def _name(record, key):
+    names = (record.get(key) or {}).get("names") or {}
+    return names.get("en", "")
+
+def _merge_record(data, record):
+    """Traduit un enregistrement MaxMind (City, Country, ASN, ISP) en champs ip-api."""
+    if "country" in record:
+        data.update(country=_name(record, "country"), countryCode=record["country"].get("iso_code", ""))
+    if record.get("subdivisions"):
+        data["regionName"] = record["subdivisions"][0].get("names", {}).get("en", "")
+    if "city" in record:
+        data["city"] = _name(record, "city")
+    if "postal" in record:
+        data["zip"] = record["postal"].get("code", "")
+    location = record.get("location") or {}
+    for field, key in (("lat", "latitude"), ("lon", "longitude"), ("timezone", "time_zone")):
+        if key in location:
+            data[field] = location[key]
+    if "autonomous_system_number" in record:
+        organization = record.get("autonomous_system_organization", "")
+        data["as"] = f"AS{record['autonomous_system_number']} {organization}".strip()
+        data.setdefault("org", organization)
+        data.setdefault("isp", organization)
+    for field, key in (("isp", "isp"), ("org", "organization")):
+        if record.get(key):
+            data[field] = record[key]
+
+def offline_lookup(ip_address, readers=None):
+    """
+    Réponse au format ip-api tirée des bases MMDB locales, sans réseau. Renvoie None si aucune base
+    n'est installée, si aucune ne connaît l'adresse, ou si ce n'est pas une adresse IP (nom d'hôte) :
+    l'appelant se rabat alors sur ip-api, qui sait résoudre les noms.
+    """
+    readers = readers if readers is not None else offline_databases()
+    if not readers:
+        return None
+    data = {}
+    try:
+        for reader in readers:
+            record = reader.get(ip_address)
+            if isinstance(record, dict):
+                _merge_record(data, record)
+    except ValueError: # Pas une adresse IP (les bases ne connaissent pas les noms d'hôte)
+        return None
+    if not data:
+        return None
+    data.update(status="success", query=ip_address)
+    return data
+
+@functools.lru_cache(maxsize=4)
+def _open_range_index(index_path, mtime):
+    return RangeIndex(index_path)
+
+def attribute_owners(ips, index_path=RANGE_INDEX_PATH):
+    """
+    Propriétaire (AS ou titulaire RIR) de chaque adresse d'après l'index de plages local (voir ip_ranges) :
+    une seule recherche vectorisée pour toute la liste, IPv4 et IPv6 mélangés, sans réseau.
+    Renvoie une liste alignée sur `ips` (None si l'adresse est inconnue ou si l'index n'existe pas).
+    """
+    owners_path = os.path.join(index_path, OWNERS_FILE)
+    if not os.path.exists(owners_path):
+        return [None] * len(ips)
+    return _open_range_index(index_path, os.path.getmtime(owners_path)).owners_of(ips)
+
+_default_cache = None
+
+def default_cache():
+    """Cache partagé par lookup_ip et lookup_ips (ouvert au premier appel)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LookupCache()
+    return _default_cache
+
+class _RateWindow:
+    """
+    Cadence calée sur les en-têtes d'ip-api : X-Rl (requêtes restantes dans la fenêtre) et X-Ttl (secondes
+    avant sa remise à zéro). Quand il ne reste plus de requête, la suivante attend la nouvelle fenêtre.
+    """
+    def __init__(self):
+        self._resume_at = 0.0
+
+    def wait(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            app_logger.info(f"ip-api rate limit reached, waiting {delay:.0f}s")
+            time.sleep(delay)
+
+    def update(self, response):
+        try:
+            remaining = int(response.headers.get('X-Rl', 1))
+            reset_in = int(response.headers.get('X-Ttl', 0))
+        except ValueError:
+            return
+        if remaining <= 0 or response.status_code == 429:
+            self._resume_at = time.monotonic() + reset_in + 1
+
+def _post_batch(session, base_url, ips, rate):
+    """Un POST /batch (jusqu'à 100 adresses). Renvoie les réponses dans l'ordre des adresses."""
+    for _ in range(2): # Une nouvelle tentative après une limitation (429)
+        rate.wait()
+        response = session.post(f"{base_url}/batch", params={"fields": IP_API_FIELDS}, json=ips,
+                                timeout=IP_API_TIMEOUT)
+        rate.update(response)
+        if response.status_code != 429:
+            break
+        app_logger.warning("Rate limited by ip-api (429), retrying after the window resets")
+    response.raise_for_status()
+    return response.json()
+
+def lookup_ips(ips, base_url=IP_API_URL, cache=None, session=None, progress=None, offline=None):
+    """
+    Recherche groupée : les adresses sont dédupliquées, servies par les bases MMDB locales ou par le cache quand
+    c'est possible, et les autres partent par lots de IP_API_BATCH_SIZE vers l'endpoint /batch, au rythme annoncé
+    par l'API (voir _RateWindow).
+    `offline` : None = bases locales d'abord puis ip-api, True = bases locales seulement, False = ip-api seulement.
+    En mode `offline=True`, les adresses absentes des bases MMDB reçoivent au moins leur propriétaire (champ "as")
+    depuis l'index de plages (attribute_owners).
+    `base_url` permet de viser un serveur local qui imite ip-api. `cache` (LookupCache) : par défaut le cache partagé.
+    `progress` (utils.progress.ProgressReporter) reçoit l'avancement et une ligne par adresse.
+    Renvoie ({ip: réponse ip-api}, statistiques) ; une adresse dont le lot a échoué reçoit
+    {"status": "fail", "message": ...}.
+    """
+    unique_ips = list(dict.fromkeys(ip.strip() for ip in ips if ip and ip.strip()))
+    cache = cache if cache is not None else default_cache()
+    if progress:
+        progress.set_total(len(unique_ips))
+
+    readers = offline_databases() if offline is not False else []
+    results = {}
+    misses = []
+    range_owners = dict(zip(unique_ips, attribute_owners(unique_ips))) if offline else {}
+    stats = {"unique": len(unique_ips), "offline": 0, "cached": 0, "requests": 0, "errors": 0}
+    for ip in unique_ips:
+        data = offline_lookup(ip, readers) if readers else None
+        if data is None and range_owners.get(ip):
+            data = {"status": "success", "query": ip, "as": range_owners[ip]}
+        if data is not None:
+            stats["offline"] += 1
+        elif offline:
+            data = {"status": "fail", "message": "not found in the offline databases", "query": ip}
+            stats["errors"] += 1
+        else:
+            data = cache.get(ip)
+            stats["cached"] += data is not None
+        if data is None:
+            misses.append(ip)
+        else:
+            results[ip] = data
+            if progress:
+                progress.result(format_summary(ip, data))
+                progress.advance()
+
+    stats["looked_up"] = len(misses)
+    own_session = session is None
+    session = session or requests.Session() # Connexion keep-alive réutilisée d'un lot à l'autre
+    rate = _RateWindow()
+    try:
+        for start in range(0, len(misses), IP_API_BATCH_SIZE):
+            batch = misses[start:start + IP_API_BATCH_SIZE]
+            stats["requests"] += 1
+            try:
+                answers = _post_batch(session, base_url, batch, rate)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                app_logger.error(f"IP batch lookup failed for {len(batch)} addresses: {e}")
+                stats["errors"] += len(batch)
+                answers = [{"status": "fail", "message": f"Request failed - {e}", "query": ip} for ip in batch]
+            else:
+                for ip, data in zip(batch, answers):
+                    cache.put(ip, data)
+            for ip, data in zip(batch, answers):
+                results[ip] = data
+                if progress:
+                    progress.result(format_summary(ip, data))
+                    progress.advance()
+    finally:
+        if own_session:
+            session.close()
+    return results, stats
+
+def format_summary(ip, data):
+    """Une ligne par adresse : 8.8.8.8  US  Mountain View  AS15169 Google LLC  (Google LLC)"""
+    if data.get("status") != "success":
+        return f"{ip}  error: {data.get('message', 'Unknown error')}"
+    location = ", ".join(v for v in (data.get('city'), data.get('countryCode')) if v)
+    owner = data.get('as') or data.get('isp') or ""
+    org = data.get('org')
+    parts = [ip, location, owner] + ([f"({org})"] if org and org not in owner else [])
+    return "  ".join(part for part in parts if part)
+
+def bulk_lookup_handler(ips_spec, progress=None, base_url=IP_API_URL, offline=None):
+    """
+    Point d'entrée pour l'interface : adresses séparées par des virgules ou des espaces,
+    ou '@fichier.txt' (une adresse par ligne).
+    """
+    if not ips_spec or not ips_spec.strip():
+        return "Error: IP address list cannot be empty."
+    spec = ips_spec.strip()
+    if spec.startswith("@"):
+        try:
+            with open(spec[1:], 'r', encoding='utf-8') as f:
+                ips = [line.split('#', 1)[0].strip() for line in f]
+        except OSError as e:
+            app_logger.error(f"Error reading IP list file: {e}")
+            return f"Error reading IP list file: {e}"
+    else:
+        ips = spec.replace(",", " ").split()
+
+    results, stats = lookup_ips(ips, base_url=base_url, progress=progress, offline=offline)
+    if progress:
+        progress.flush()
+    output = f"Bulk IP Lookup Results ({stats['unique']} unique address(es)):\n"
+    output += "----------------------------------------\n"
+    output += "\n".join(format_summary(ip, data) for ip, data in results.items()) + "\n"
+    output += (f"\n{stats['offline']} answered by the offline database, {stats['cached']} served from cache, "
+               f"{stats['looked_up']} looked up in {stats['requests']} batch request(s).\n")
+    if stats["errors"]:
+        output += f"{stats['errors']} address(es) could not be looked up (see log).\n"
+    app_logger.info(f"Bulk IP lookup finished: {stats}")
+    return output
+
+def lookup_ip(ip_address, base_url=IP_API_URL, offline=None):
     """
     Looks up IP information using ip-api.com (no API key needed for free tier).
+    Si une base MMDB locale est installée (GEOIP_DATABASES), elle répond d'abord, sans réseau ; ip-api sert
+    de repli. `offline=True` n'interroge que les bases locales, `offline=False` que ip-api.
+    Les réponses d'ip-api sont gardées dans le cache partagé (voir LookupCache).
     """
     app_logger.info(f"Performing IP lookup for: {ip_address}")
     if not ip_address:
         return "Error: IP address cannot be empty."
+    ip_address = ip_address.strip()
     try:
-        # Utiliser ip-api.com qui est généralement plus permissif sans clé
-        response = requests.get(f"http://ip-api.com/json/{ip_address}", timeout=5)
-        response.raise_for_status()  # Lève une exception pour les codes d'erreur HTTP
-        data = response.json()
+        data = offline_lookup(ip_address) if offline is not False else None
+        source = "offline database" if data is not None else "ip-api.com"
+        if data is None and offline:
+            return f"Error: {ip_address} was not found in the offline GeoIP databases."
+        if data is None:
+            data = default_cache().get(ip_address)
+        if data is None:
+            # Utiliser ip-api.com qui est généralement plus permissif sans clé
+            response = requests.get(f"{base_url}/json/{ip_address}", params={"fields": IP_API_FIELDS}, timeout=5)
+            response.raise_for_status()  # Lève une exception pour les codes d'erreur HTTP
+            data = response.json()
+            default_cache().put(ip_address, data)
 
         if data.get("status") == "success":
             output = f"IP Lookup Results for: {data.get('query', ip_address)}\n"
             output += "----------------------------------------\n"
-            fields = ['country', 'countryCode', 'regionName', 'city', 'zip', 'lat', 'lon', 'timezone', 'isp', 'org', 'as']
-            for field in fields:
+            for field in DISPLAY_FIELDS:
                 if data.get(field):
                     output += f"{field.replace('as', 'ASN').capitalize()}: {data.get(field)}\n"
+            output += f"Source: {source}\n"
             app_logger.info(f"IP lookup successful for {ip_address}")
             return output
         else:
@@ -43,4 +381,6 @@ if __name__ == '__main__':
     test_ip = "8.8.8.8"
     print(lookup_ip(test_ip))
     test_ip_fail = "invalid"
-    print(lookup_ip(test_ip_fail))
\ No newline at end of file
+    print(lookup_ip(test_ip_fail))
+    # Recherche groupée ; pour tester hors ligne, viser un serveur local : bulk_lookup_handler(..., base_url="http://127.0.0.1:8080")
+    print(bulk_lookup_handler("8.8.8.8, 1.1.1.1, 8.8.8.8"))
\ No newline at end of file
@@ -0,0 +1,247 @@
+# SXTOOLS PREMIUM/core/osint/ip_ranges.py
+import heapq
+import ipaddress
+import json
+import os
+import socket
+import numpy as np
+from utils.logger import app_logger
+
+RANGE_INDEX_PATH = os.path.join("data", "ip_ranges")
+OWNERS_FILE = "owners.json"
+# Clé IPv6 sur 128 bits : deux entiers 64 bits (poids fort, poids faible), triés dans cet ordre par numpy
+V6_KEY = np.dtype([("hi", np.uint64), ("lo", np.uint64)])
+_LOW_64 = (1 << 64) - 1
+
+def _address_key(version, address):
+    """Clé numérique d'une adresse : l'entier de l'adresse (32 bits en IPv4, 128 bits en IPv6)."""
+    return int(address)
+
+def _ranges_from_ip2asn(fields):
+    # ip2asn (iptoasn.com) : début, fin, numéro d'AS, pays, description
+    if len(fields) < 5 or fields[2] == "0": # AS 0 = plage non routée
+        return None
+    owner = f"AS{fields[2]} {fields[4]}".strip()
+    return ipaddress.ip_address(fields[0]), ipaddress.ip_address(fields[1]), owner
+
+def _ranges_from_delegation(fields):
+    # Fichier de délégation RIR : registre|pays|type|début|valeur|date|statut[|identifiant opaque]
+    if len(fields) < 7 or fields[2] not in ("ipv4", "ipv6") or fields[1] == "*" or not fields[3][0].isalnum():
+        return None
+    start = ipaddress.ip_address(fields[3])
+    if fields[2] == "ipv4":
+        end = start + int(fields[4]) - 1 # Valeur = nombre d'adresses
+    else:
+        end = ipaddress.ip_network(f"{fields[3]}/{fields[4]}").broadcast_address # Valeur = longueur de préfixe
+    owner = f"{fields[0].upper()} {fields[1]} {fields[6]}"
+    if len(fields) > 7 and fields[7]:
+        owner += f" {fields[7]}"
+    return start, end, owner
+
+def _ranges_from_cidr(fields):
+    # Préfixe suivi du propriétaire (ex: dump BGP "1.0.0.0/24 AS13335 Cloudflare")
+    network = ipaddress.ip_network(fields[0], strict=False)
+    owner = " ".join(fields[1:]) or "unknown"
+    return network.network_address, network.broadcast_address, owner
+
+def iter_ranges(path, kind="auto"):
+    """
+    Lit une source de plages et produit (version, début, fin, propriétaire). `kind` :
+    - "ip2asn" : dump TSV ip2asn (début, fin, AS, pays, description) ;
+    - "delegation" : fichier de délégation des RIR (delegated-*-extended-latest) ;
+    - "cidr" : une ligne par préfixe, suivi du propriétaire.
+    "auto" reconnaît le format sur chaque ligne (séparateur '|', tabulations ou préfixe CIDR).
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            line_kind = kind
+            if kind == "auto":
+                line_kind = "delegation" if '|' in line else "ip2asn" if '\t' in line and '/' not in line.split('\t', 1)[0] else "cidr"
+            try:
+                if line_kind == "delegation":
+                    entry = _ranges_from_delegation(line.split('|'))
+                elif line_kind == "ip2asn":
+                    entry = _ranges_from_ip2asn(line.split('\t'))
+                else:
+                    entry = _ranges_from_cidr(line.split())
+            except (ValueError, IndexError):
+                app_logger.debug(f"Skipping unparsable range line in {path}: {line[:80]}")
+                continue
+            if entry and entry[0].version == entry[1].version:
+                yield entry[0].version, entry[0], entry[1], entry[2]
+
+def _flatten(ranges):
+    """
+    Rend les plages disjointes : une plage plus spécifique incluse dans une autre l'emporte sur sa portion,
+    la plage englobante reprend après elle. `ranges` : [(début, fin, id)] ; renvoie la liste triée des segments.
+    """
+    pending = [(start, -end, owner_id) for start, end, owner_id in ranges]
+    heapq.heapify(pending) # Par début croissant, la plus large d'abord
+    segments = []
+    stack = [] # Plages englobantes ouvertes : (fin, id)
+    cursor = 0
+    def emit(start, end, owner_id):
+        if start <= end:
+            if segments and segments[-1][2] == owner_id and segments[-1][1] + 1 == start:
+                segments[-1] = (segments[-1][0], end, owner_id) # Segments contigus du même propriétaire
+            else:
+                segments.append((start, end, owner_id))
+    while pending:
+        start, end, owner_id = heapq.heappop(pending)
+        end = -end
+        while stack and stack[-1][0] < start:
+            top_end, top_id = stack.pop()
+            emit(cursor, top_end, top_id)
+            cursor = max(cursor, top_end + 1)
+        if stack:
+            emit(cursor, start - 1, stack[-1][1])
+        cursor = max(cursor, start)
+        if stack and end > stack[-1][0]:
+            # Chevauchement partiel : la partie qui dépasse est retraitée après la fin de la plage englobante
+            heapq.heappush(pending, (stack[-1][0] + 1, -end, owner_id))
+            end = stack[-1][0]
+        stack.append((end, owner_id))
+    while stack:
+        top_end, top_id = stack.pop()
+        emit(cursor, top_end, top_id)
+        cursor = max(cursor, top_end + 1)
+    return segments
+
+def build_range_index(sources, index_path=RANGE_INDEX_PATH, kind="auto"):
+    """
+    Construit l'index à partir de dumps ASN ou RIR : pour chaque famille, trois tableaux numpy triés
+    (débuts, fins, numéro de propriétaire) sauvegardés en .npy, et la table des propriétaires en JSON.
+    Renvoie le nombre de segments indexés.
+    """
+    owners = {}
+    ranges = {4: [], 6: []}
+    for source in sources:
+        for version, start, end, owner in iter_ranges(source, kind):
+            owner_id = owners.setdefault(owner, len(owners))
+            ranges[version].append((_address_key(version, start), _address_key(version, end), owner_id))
+        app_logger.info(f"Imported ranges from {source}")
+    if not os.path.exists(index_path):
+        os.makedirs(index_path)
+    count = 0
+    for version, dtype in ((4, np.uint32), (6, V6_KEY)):
+        segments = _flatten(ranges[version])
+        count += len(segments)
+        columns = list(zip(*segments)) if segments else [[], [], []]
+        if version == 6:
+            columns[0:2] = [[(key >> 64, key & _LOW_64) for key in column] for column in columns[0:2]]
+        for name, values, column_type in (("starts", columns[0], dtype), ("ends", columns[1], dtype),
+                                          ("owners", columns[2], np.int32)):
+            tmp_path = os.path.join(index_path, f"v{version}_{name}.tmp.npy")
+            np.save(tmp_path, np.array(values, dtype=column_type))
+            os.replace(tmp_path, os.path.join(index_path, f"v{version}_{name}.npy"))
+    with open(os.path.join(index_path, OWNERS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(sorted(owners, key=owners.get), f)
+    app_logger.info(f"IP range index {index_path} now holds {count} segments and {len(owners)} owners")
+    return count
+
+def _pack_addresses(ips):
+    """
+    Convertit les adresses en clés numpy (inet_pton, sans ipaddress : quelques centaines de ns par adresse).
+    Renvoie (clés IPv4, positions IPv4, clés IPv6, positions IPv6) ; les chaînes invalides sont ignorées.
+    """
+    v4_packed, v4_positions, v6_packed, v6_positions = [], [], [], []
+    for position, ip in enumerate(ips):
+        try:
+            v4_packed.append(socket.inet_pton(socket.AF_INET, ip))
+            v4_positions.append(position)
+            continue
+        except (OSError, TypeError):
+            pass
+        try:
+            v6_packed.append(socket.inet_pton(socket.AF_INET6, ip))
+            v6_positions.append(position)
+        except (OSError, TypeError):
+            pass
+    v4_keys = np.frombuffer(b"".join(v4_packed), dtype='>u4').astype(np.uint32)
+    v6_keys = np.frombuffer(b"".join(v6_packed), dtype=[("hi", '>u8'), ("lo", '>u8')]).astype(V6_KEY)
+    return v4_keys, np.array(v4_positions, dtype=np.int64), v6_keys, np.array(v6_positions, dtype=np.int64)
+
+class RangeIndex:
+    """
+    Index de plages en lecture. Les tableaux .npy sont projetés en mémoire (np.load mmap_mode='r') : l'ouverture
+    est immédiate quelle que soit la taille, et seules les pages touchées par les recherches sont lues.
+    Une recherche groupée est un seul np.searchsorted vectorisé par famille d'adresses.
+    En IPv6, les clés font 128 bits (V6_KEY) : un enregistrement plus long qu'un /64 ne couvre que ses adresses.
+    Un index construit avant ce format (clés IPv6 sur 64 bits) reste lisible, avec l'ancienne précision.
+    """
+    def __init__(self, index_path=RANGE_INDEX_PATH):
+        self.path = index_path
+        self.tables = {}
+        for version in (4, 6):
+            self.tables[version] = tuple(np.load(os.path.join(index_path, f"v{version}_{name}.npy"), mmap_mode='r')
+                                         for name in ("starts", "ends", "owners"))
+        with open(os.path.join(index_path, OWNERS_FILE), 'r', encoding='utf-8') as f:
+            self.owners = json.load(f)
+
+    def __len__(self):
+        return sum(len(starts) for starts, _, _ in self.tables.values())
+
+    def _owner_ids(self, version, keys):
+        starts, ends, owner_ids = self.tables[version]
+        result = np.full(len(keys), -1, dtype=np.int32)
+        if not len(starts) or not len(keys):
+            return result
+        if version == 6 and starts.dtype.names is None:
+            keys = keys["hi"] # Ancien index : 64 bits de poids fort seulement
+        slots = np.searchsorted(starts, keys, side='right') - 1 # Dernier segment qui commence avant la clé
+        candidates = np.clip(slots, 0, None)
+        ends = ends[candidates]
+        if keys.dtype.names: # Comparaison lexicographique (poids fort, puis poids faible)
+            within = (keys["hi"] < ends["hi"]) | ((keys["hi"] == ends["hi"]) & (keys["lo"] <= ends["lo"]))
+        else:
+            within = keys <= ends
+        hit = (slots >= 0) & within
+        result[hit] = owner_ids[candidates[hit]]
+        return result
+
+    def owner_ids(self, ips):
+        """Numéro de propriétaire de chaque adresse (tableau numpy aligné sur `ips`, -1 si inconnue ou invalide)."""
+        v4_keys, v4_positions, v6_keys, v6_positions = _pack_addresses(ips)
+        result = np.full(len(ips), -1, dtype=np.int32)
+        result[v4_positions] = self._owner_ids(4, v4_keys)
+        result[v6_positions] = self._owner_ids(6, v6_keys)
+        return result
+
+    def owners_of(self, ips):
+        """Propriétaire de chaque adresse (liste alignée sur `ips`, None si inconnue)."""
+        return [self.owners[i] if i >= 0 else None for i in self.owner_ids(ips).tolist()]
+
+def range_index_available(index_path=RANGE_INDEX_PATH):
+    return os.path.exists(os.path.join(index_path, OWNERS_FILE))
+
+def import_range_sources(paths, index_path=RANGE_INDEX_PATH):
+    """Point d'entrée pour l'interface : importe un ou plusieurs dumps (séparés par des virgules)."""
+    if isinstance(paths, str):
+        paths = [p.strip() for p in paths.split(",") if p.strip()]
+    if not paths:
+        return "Error: No source file given."
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        return f"Error: Source file(s) not found: {', '.join(missing)}"
+    try:
+        count = build_range_index(paths, index_path)
+    except (OSError, ValueError) as e:
+        app_logger.error(f"Range import failed: {e}")
+        return f"Error importing range sources: {e}"
+    return f"Imported {len(paths)} source(s) into {index_path}: {count} ranges indexed."
+
+if __name__ == '__main__':
+    import sys
+    # Import : python -m core.osint.ip_ranges import ip2asn-combined.tsv delegated-ripencc-extended-latest
+    # Requête : python -m core.osint.ip_ranges query 8.8.8.8 2001:4860::8888
+    if len(sys.argv) >= 3 and sys.argv[1] == "import":
+        print(import_range_sources(sys.argv[2:]))
+    elif len(sys.argv) >= 3 and sys.argv[1] == "query":
+        index = RangeIndex()
+        for ip, owner in zip(sys.argv[2:], index.owners_of(sys.argv[2:])):
+            print(f"{ip}\t{owner or 'unknown'}")
+    else:
+        print("Usage: python -m core.osint.ip_ranges import <files...> | query <ips...>")
@@ -1,79 +1,201 @@
 # MXTools/core/osint/social_media_finder.py
-import requests
-import threading
-from queue import Queue
+import asyncio
+import codecs
+import functools
+import json
+import os
+import re
+import aiohttp
 from utils.logger import app_logger
+from utils.rate_limiter import Pacer
+from utils.worker_pool import run_coroutine
 
-NUM_THREADS_SOCIAL = 10
-social_q = Queue()
-
-# Dictionnaire des sites et de leurs URLs de profil. Le {} sera remplacé par le nom d'utilisateur.
-# On vérifie aussi le code de statut attendu si le profil n'existe pas (la plupart sont 404).
-SOCIAL_MEDIA_SITES = {
-    "Instagram": ("https://www.instagram.com/{}", 404),
-    "Twitter / X": ("https://twitter.com/{}", 404),
-    "GitHub": ("https://github.com/{}", 404),
-    "Reddit": ("https://www.reddit.com/user/{}", 404),
-    "Pinterest": ("https://www.pinterest.com/{}", 404),
-    "TikTok": ("https://www.tiktok.com/@{}", 404),
-    "Steam": ("https://steamcommunity.com/id/{}", 200), # Steam redirige, donc on vérifie si la page contient "The specified profile could not be found."
-    "Twitch": ("https://www.twitch.tv/{}", 404),
-    "YouTube": ("https://www.youtube.com/@{}", 404),
-    "Vimeo": ("https://vimeo.com/{}", 404),
-    "GitLab": ("https://gitlab.com/{}", 404),
-}
-
-def check_profile(site_name, url_template, not_found_status, username, found_profiles_list):
-    """Vérifie l'existence d'un profil sur un site donné."""
-    url = url_template.format(username)
+SOCIAL_CONCURRENCY = 100 # Requêtes en vol max, tous sites confondus (adaptée par le Pacer)
+SOCIAL_CONNECTIONS_PER_HOST = 4 # Connexions simultanées max vers un même site
+SOCIAL_RATE_PER_SITE = None # Requêtes/s max par site (None = pas de limite)
+SOCIAL_TIMEOUT = 5
+SITE_CATALOG_PATH = "wordlists/social_sites.json"
+MARKER_CHUNK_SIZE = 8192
+MAX_MARKER_BYTES = 262144 # Au-delà, on conclut sans marqueur plutôt que de télécharger toute la page
+
+class SiteRule:
+    """
+    Règle de détection d'un site du catalogue, compilée une seule fois au chargement :
+    - `url` : gabarit d'URL de profil, {} est remplacé par le nom d'utilisateur ;
+    - `found_status` : codes qui signalent un profil existant (par défaut, tout code < 400) ;
+    - `not_found_status` : codes qui signalent un profil absent (404 pour la plupart des sites) ;
+    - `positive_markers` : textes dont l'un doit figurer dans la page pour conclure à un profil ;
+    - `negative_markers` : textes qui signalent une page "profil introuvable" malgré un 200 (ex: Steam) ;
+    - `follow_redirects` : suivre les redirections (par défaut oui).
+    """
+    def __init__(self, name, url, found_status=None, not_found_status=None, positive_markers=None,
+                 negative_markers=None, follow_redirects=True):
+        if "{}" not in url:
+            raise ValueError(f"Site '{name}': URL template must contain '{{}}'")
+        self.name = name
+        self.url = url
+        self.found_status = set(found_status or ())
+        self.not_found_status = set(not_found_status or ())
+        self.has_positive = bool(positive_markers)
+        self.markers = self._compile(positive_markers or [], negative_markers or [])
+        # Longueur du plus long marqueur : recouvrement gardé entre deux blocs pour ne pas rater un marqueur coupé
+        self.overlap = max((len(m) for m in (positive_markers or []) + (negative_markers or [])), default=0)
+        self.follow_redirects = follow_redirects
+
+    @staticmethod
+    def _compile(positive, negative):
+        groups = []
+        if positive:
+            groups.append("(?P<positive>" + "|".join(re.escape(marker) for marker in positive) + ")")
+        if negative:
+            groups.append("(?P<negative>" + "|".join(re.escape(marker) for marker in negative) + ")")
+        return re.compile("|".join(groups)) if groups else None
+
+    @property
+    def needs_body(self):
+        return self.markers is not None
+
+    def status_found(self, status):
+        """Premier tri sur le code HTTP : False = absent, True = présent (sous réserve des marqueurs)."""
+        if status in self.not_found_status:
+            return False
+        if self.found_status:
+            return status in self.found_status
+        return status < 400
+
+    def marker_verdict(self, text):
+        """True si un marqueur positif apparaît dans `text`, False si c'est un marqueur négatif, None sinon."""
+        match = self.markers.search(text)
+        if match is None:
+            return None
+        return match.lastgroup == "positive"
+
+    def verdict_without_marker(self):
+        """Page lue (ou plafond atteint) sans marqueur : présent seulement si aucun marqueur positif n'était exigé."""
+        return not self.has_positive
+
+async def match_markers(response, site, max_bytes=MAX_MARKER_BYTES):
+    """
+    Cherche les marqueurs du site dans le corps lu en flux, bloc par bloc : la lecture s'arrête au premier
+    marqueur trouvé ou après `max_bytes` octets, le reste de la page n'est jamais téléchargé.
+    """
     try:
-        headers = {'User-Agent': 'SXTOOLS PREMIUM Social Finder/1.0'}
-        response = requests.get(url, timeout=5, allow_redirects=True, headers=headers)
-
-        # Logique de détection spécifique
-        found = False
-        if site_name == "Steam":
-            if response.status_code == 200 and "The specified profile could not be found." not in response.text:
-                found = True
-        elif response.status_code != not_found_status and response.status_code < 400:
-            found = True
-
-        if found:
-            app_logger.info(f"Found profile for '{username}' on {site_name}: {url}")
-            found_profiles_list.append(f"[{site_name}] {url}")
-
-    except requests.exceptions.Timeout:
+        decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+    except LookupError: # Charset inconnu annoncé par le serveur
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    tail = ""
+    read = 0
+    async for chunk in response.content.iter_chunked(MARKER_CHUNK_SIZE):
+        read += len(chunk)
+        text = tail + decoder.decode(chunk)
+        verdict = site.marker_verdict(text)
+        if verdict is not None:
+            return verdict
+        if read >= max_bytes:
+            break
+        tail = text[-site.overlap:]
+    return site.verdict_without_marker()
+
+@functools.lru_cache(maxsize=8)
+def _load_catalog(path, mtime):
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError(f"Site catalog {path} must be a JSON list of site rules")
+    try:
+        return tuple(SiteRule(**entry) for entry in entries)
+    except TypeError as e:
+        raise ValueError(f"Invalid site rule in {path}: {e}")
+
+def load_site_catalog(path=SITE_CATALOG_PATH):
+    """Charge et compile le catalogue de sites (mis en cache tant que le fichier ne change pas). Lève ValueError."""
+    if not os.path.exists(path):
+        raise ValueError(f"Site catalog not found: {path}")
+    try:
+        return _load_catalog(path, os.path.getmtime(path))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read site catalog {path}: {e}")
+
+async def check_profile(session, site, username, found_profiles_list, progress=None):
+    """
+    Vérifie l'existence d'un profil sur un site du catalogue. Renvoie le résultat pour le Pacer :
+    True si le site a répondu normalement, False en cas de timeout ou de limitation (429), None sinon.
+    """
+    url = site.url.format(username)
+    try:
+        async with session.get(url, allow_redirects=site.follow_redirects) as response:
+            if response.status == 429:
+                app_logger.warning(f"Rate limited by {site.name} while checking {url}")
+                return False
+            found = site.status_found(response.status)
+            if found and site.needs_body:
+                found = await match_markers(response, site)
+            # Sites sans marqueur : le corps n'est pas lu, la connexion est fermée à la sortie du bloc
+    except asyncio.TimeoutError:
         app_logger.warning(f"Timeout checking {url}")
-    except requests.exceptions.RequestException as e:
+        return False
+    except aiohttp.ClientError as e:
         app_logger.debug(f"Request exception for {url}: {e}")
+        return None
+
+    if found:
+        app_logger.info(f"Found profile for '{username}' on {site.name}: {url}")
+        found_profiles_list.append(f"[{site.name}] {url}")
+        if progress:
+            progress.result(f"[{site.name}] {url}")
+    return True
 
-def social_worker(username, found_profiles_list):
-    """Worker thread pour traiter la file d'attente des sites."""
-    while not social_q.empty():
-        site_name, (url_template, not_found_status) = social_q.get()
-        check_profile(site_name, url_template, not_found_status, username, found_profiles_list)
-        social_q.task_done()
+async def _check_site(session, site, username, found_profiles_list, progress, pacer):
+    await pacer.acquire_async(site.name)
+    outcome = None
+    try:
+        outcome = await check_profile(session, site, username, found_profiles_list, progress)
+    except Exception as e: # Erreur imprévue (SSL, décodage, règle du catalogue) : seul ce site est perdu
+        app_logger.error(f"Profile check failed on {site.name}: {e}", exc_info=True)
+    finally:
+        await pacer.release_async(outcome)
+    if progress:
+        progress.advance()
 
-def find_profiles(username):
+async def _find_profiles_async(username, sites, found_profiles_list, progress, pacer):
+    # Une seule session : pool de connexions partagé, plafonné par hôte pour ne pas marteler un site
+    connector = aiohttp.TCPConnector(limit=SOCIAL_CONCURRENCY, limit_per_host=SOCIAL_CONNECTIONS_PER_HOST)
+    timeout = aiohttp.ClientTimeout(total=SOCIAL_TIMEOUT)
+    headers = {'User-Agent': 'SXTOOLS PREMIUM Social Finder/1.0'}
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+        await asyncio.gather(*(_check_site(session, site, username, found_profiles_list, progress, pacer)
+                               for site in sites))
+
+def find_profiles(username, progress=None, pacer=None, catalog_path=SITE_CATALOG_PATH, pool=None):
     """
     Recherche des profils sur les réseaux sociaux pour un nom d'utilisateur donné.
+    Les sites et leurs règles de détection viennent du catalogue `catalog_path` (voir SiteRule) ;
+    toutes les vérifications partent en parallèle sur un moteur asyncio, la durée totale est
+    donc proche de celle du site le plus lent.
+    `progress` (utils.progress.ProgressReporter) reçoit l'avancement et les profils trouvés au fil de l'eau.
+    `pacer` (utils.rate_limiter.Pacer) cadence les requêtes ; par défaut la concurrence s'adapte aux timeouts.
+    `pool` (utils.worker_pool.ScanPool) fait tourner la recherche sur la boucle asyncio partagée entre scans.
     """
     app_logger.info(f"Starting social media profile search for username: {username}")
     if not username:
         return "Error: Username cannot be empty."
 
-    # Remplir la queue avec les sites à vérifier
-    for site, data in SOCIAL_MEDIA_SITES.items():
-        social_q.put((site, data))
+    try:
+        sites = load_site_catalog(catalog_path)
+    except ValueError as e:
+        app_logger.error(str(e))
+        return f"Error: {e}"
 
-    found_profiles = []
-    threads = []
-    for _ in range(min(NUM_THREADS_SOCIAL, len(SOCIAL_MEDIA_SITES))):
-        t = threading.Thread(target=social_worker, args=(username, found_profiles), daemon=True)
-        threads.append(t)
-        t.start()
+    if progress:
+        progress.set_total(len(sites))
 
-    social_q.join() # Attendre que tous les threads aient fini
+    if pacer is None:
+        pacer = Pacer(SOCIAL_CONCURRENCY, min_concurrency=2, per_target_rate=SOCIAL_RATE_PER_SITE)
+
+    found_profiles = []
+    run_coroutine(_find_profiles_async(username, sites, found_profiles, progress, pacer), pool)
+    if progress:
+        progress.flush()
 
     result_str = f"Social Media Profiles for '{username}':\n"
     result_str += "----------------------------------------\n"
@@ -81,6 +203,6 @@ def find_profiles(username):
         result_str += "\n".join(sorted(found_profiles))
     else:
         result_str += "No profiles found for this username on the checked sites."
-    
+
     app_logger.info(f"Social media profile search finished for '{username}'.")
-    return result_str
\ No newline at end of file
+    return result_str
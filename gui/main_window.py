@@ -5,6 +5,7 @@ from PIL import Image # Importer Image de Pillow
 import os
 import webbrowser
 import threading
+import functools
 
 # Importer les modules core
 from core.osint import ip_lookup, email_analyzer, phone_lookup, whois_dns, metadata_extractor, social_media_finder
@@ -18,6 +19,8 @@ from core.gaming import performance_booster
 from utils.logger import app_logger
 from utils.exporter import Exporter
 from utils.config_manager import save_config, load_config, DEFAULT_CONFIG
+from utils.progress import ProgressReporter, format_progress
+from utils.worker_pool import shared_pool
 
 class MainWindow(ctk.CTk):
     def __init__(self, config):
@@ -141,7 +144,7 @@ class MainWindow(ctk.CTk):
             title="Social Media Profile Finder",
             entry_placeholder="Enter username (e.g., 'johnsmith')",
             button_text="Find Profiles",
-            button_command=lambda: self.run_in_thread(social_media_finder.find_profiles, social_entry.get(), social_results)
+            button_command=lambda: self.run_in_thread(functools.partial(social_media_finder.find_profiles, pool=shared_pool()), social_entry.get(), social_results, stream=True)
         )
         social_frame.pack(fill="x", expand=True, pady=(0, 15), padx=5)
 
@@ -149,9 +152,11 @@ class MainWindow(ctk.CTk):
         ip_frame, ip_entry, ip_results = self.create_styled_widget_frame(
             parent=main_scroll_frame,
             title="IP Address Lookup",
-            entry_placeholder="Enter IP Address (e.g., 8.8.8.8)",
+            entry_placeholder="Enter IP Address (e.g., 8.8.8.8), a list or @file.txt for bulk",
             button_text="Lookup IP",
-            button_command=lambda: self.run_in_thread(ip_lookup.lookup_ip, ip_entry.get(), ip_results)
+            button_command=lambda: self.run_in_thread(ip_lookup.lookup_ip, ip_entry.get(), ip_results),
+            second_button_text="Bulk Lookup",
+            second_button_command=lambda: self.run_in_thread(ip_lookup.bulk_lookup_handler, ip_entry.get(), ip_results, stream=True)
         )
         ip_frame.pack(fill="x", expand=True, pady=(0, 15), padx=5)
 
@@ -159,9 +164,13 @@ class MainWindow(ctk.CTk):
         email_frame, email_entry, email_results = self.create_styled_widget_frame(
             parent=main_scroll_frame,
             title="Email Address Analyzer",
-            entry_placeholder="Enter Email Address",
+            entry_placeholder="Enter Email Address, or @file.txt for a bulk analysis",
             button_text="Analyze Email",
-            button_command=lambda: self.run_in_thread(email_analyzer.analyze_email, email_entry.get(), email_results)
+            button_command=lambda: self.run_in_thread(email_analyzer.analyze_email, email_entry.get(), email_results),
+            second_button_text="Bulk Analyze (File)",
+            second_button_command=lambda: self.run_in_thread(
+                functools.partial(email_analyzer.analyze_email_file, pool=shared_pool()), email_entry.get(), email_results,
+                stream=True)
         )
         email_frame.pack(fill="x", expand=True, pady=(0, 15), padx=5)
 
@@ -248,14 +257,41 @@ class MainWindow(ctk.CTk):
         main_scroll_frame = self.create_main_scrollable_frame(parent_frame)
 
         # --- Port Scanner ---
-        port_frame, port_entry, port_results = self.create_styled_widget_frame(
-            parent=main_scroll_frame,
-            title="Port Scanner",
-            entry_placeholder="Enter Domain or IP",
-            button_text="Scan Ports",
-            button_command=lambda: self.run_in_thread(port_scanner.scan_ports, port_entry.get(), port_results)
-        )
+        port_frame = self.create_themed_frame(main_scroll_frame)
         port_frame.pack(fill="x", expand=True, pady=(0, 15), padx=5)
+        self.create_themed_title_label(port_frame, "Port Scanner").pack(anchor="w", padx=10, pady=(5, 5))
+
+        port_input_frame = ctk.CTkFrame(port_frame, fg_color="transparent")
+        port_input_frame.pack(fill="x", padx=10, pady=(0, 10))
+
+        port_entry = self.create_themed_entry(port_input_frame, placeholder_text="Enter Domain, IP, CIDR or @targets.txt")
+        port_entry.pack(side="left", fill="x", expand=True, ipady=4)
+
+        port_spec_entry = self.create_themed_entry(port_input_frame, placeholder_text="Ports (e.g., 1-1024, top100, udp:53,161)", width=200)
+        port_spec_entry.pack(side="left", padx=(5, 5))
+
+        port_fp_var = ctk.StringVar(value="off")
+        port_fp_switch = ctk.CTkSwitch(port_input_frame, text="Service detection", variable=port_fp_var, onvalue="on", offvalue="off")
+        self.themed_checkboxes.append(port_fp_switch)
+        port_fp_switch.pack(side="left", padx=(5, 0))
+
+        port_tls_var = ctk.StringVar(value="off")
+        port_tls_switch = ctk.CTkSwitch(port_input_frame, text="TLS certs", variable=port_tls_var, onvalue="on", offvalue="off")
+        self.themed_checkboxes.append(port_tls_switch)
+        port_tls_switch.pack(side="left", padx=(5, 0))
+
+        port_results = self.create_themed_textbox(port_frame)
+        port_results.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        port_button = self.create_themed_button(
+            port_frame, "Scan Ports",
+            lambda: self.run_in_thread(
+                functools.partial(port_scanner.scan_ports_handler, fingerprint=port_fp_var.get() == "on",
+                                  harvest_certs=port_tls_var.get() == "on", pool=shared_pool()),
+                port_entry.get(), port_spec_entry.get(), port_results, stream=True
+            )
+        )
+        port_button.pack(fill="x", padx=10, pady=(0, 10))
 
         # --- Subdomain Finder ---
         sub_frame, sub_entry, sub_results = self.create_styled_widget_frame(
@@ -263,7 +299,9 @@ class MainWindow(ctk.CTk):
             title="Subdomain Finder",
             entry_placeholder="Enter Domain (e.g., google.com)",
             button_text="Find Subdomains",
-            button_command=lambda: self.run_in_thread(subdomain_finder.find_subdomains, sub_entry.get(), sub_results)
+            button_command=lambda: self.run_in_thread(functools.partial(subdomain_finder.find_subdomains, pool=shared_pool()), sub_entry.get(), sub_results, stream=True),
+            second_button_text="Known Names (Offline)",
+            second_button_command=lambda: self.run_in_thread(subdomain_finder.passive_lookup, sub_entry.get(), sub_results)
         )
         sub_frame.pack(fill="x", expand=True, pady=(0, 15), padx=5)
 
@@ -649,14 +687,31 @@ class MainWindow(ctk.CTk):
             result_widget.delete(0, "end")
             result_widget.insert(0, result_text)
 
-    def run_in_thread(self, target_func, *args):
+    def append_results(self, lines, status_text, result_widget):
+        """Met à jour la ligne de statut (1re ligne) et ajoute les résultats partiels à la suite."""
+        result_widget.configure(state="normal")
+        result_widget.delete("1.0", "1.end")
+        result_widget.insert("1.0", status_text)
+        if lines:
+            result_widget.insert("end", "\n".join(lines) + "\n")
+        result_widget.configure(state="disabled")
+
+    def run_in_thread(self, target_func, *args, stream=False):
+        """
+        Exécute target_func dans un thread. Avec stream=True, la fonction reçoit un `progress`
+        (ProgressReporter) et ses résultats partiels sont ajoutés au fur et à mesure, par lots.
+        """
         result_widget = args[-1]
         thread_args = args[:-1]
         
+        def on_batch(lines, done, total, rate):
+            self.after(0, self.append_results, lines, format_progress(done, total, rate), result_widget)
+
         def task_wrapper():
             try:
-                self.display_results("Running...", result_widget)
-                result = target_func(*thread_args)
+                self.display_results("Running...\n", result_widget)
+                kwargs = {"progress": ProgressReporter(on_batch)} if stream else {}
+                result = target_func(*thread_args, **kwargs)
                 self.after(0, self.display_results, result, result_widget)
             except Exception as e:
                 error_msg = f"An error occurred in the tool:\n{type(e).__name__}: {e}"
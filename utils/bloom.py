@@ -0,0 +1,43 @@
+# SXTOOLS PREMIUM/utils/bloom.py
+import hashlib
+import math
+
+MAX_HASHES = 16 # blake2b fournit au plus 64 octets, soit 16 positions de 32 bits
+MAX_BITS = 1 << 32
+
+class BloomFilter:
+    """
+    Ensemble probabiliste compact : `x in f` peut être un faux positif (taux ~ `error_rate` à `capacity`
+    éléments), jamais un faux négatif. Environ 24 bits par élément à 1e-5, au lieu d'une chaîne Python complète.
+    """
+    def __init__(self, capacity, error_rate=1e-5):
+        capacity = max(1, int(capacity))
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.size = min(self.size, MAX_BITS)
+        self.hash_count = min(MAX_HASHES, max(1, int(round(self.size / capacity * math.log(2)))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Une seule empreinte blake2b découpée en k entiers de 32 bits : pas de boucle de hachage en Python
+        digest = hashlib.blake2b(item.encode('utf-8', errors='replace'), digest_size=4 * self.hash_count).digest()
+        size = self.size
+        return [h % size for h in memoryview(digest).cast('I')]
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def add(self, item):
+        """Ajoute `item`. Renvoie True s'il était absent (aux faux positifs près)."""
+        new = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __len__(self):
+        return self.count
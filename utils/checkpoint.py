@@ -0,0 +1,83 @@
+# SXTOOLS PREMIUM/utils/checkpoint.py
+import json
+import os
+import re
+import threading
+import time
+from utils.logger import app_logger
+
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_INTERVAL = 10 # Secondes entre deux sauvegardes
+
+def default_checkpoint_path(kind, key):
+    """Chemin de checkpoint dérivé du type de scan et de ses paramètres (ex: cible + ports)."""
+    safe_key = re.sub(r'[^A-Za-z0-9._-]+', '_', str(key)).strip('_')[:80] or "scan"
+    return os.path.join(CHECKPOINT_DIR, f"{kind}_{safe_key}.json")
+
+def load_checkpoint(path):
+    """Charge un checkpoint. Lève ValueError si le fichier est absent ou illisible."""
+    if not os.path.exists(path):
+        raise ValueError(f"Checkpoint not found: {path}")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read checkpoint {path}: {e}")
+
+class Checkpoint:
+    """
+    Sauvegarde périodique de l'avancement d'un scan. Le travail est numéroté dans l'ordre où il est
+    distribué ; l'offset enregistré est le plus petit numéro pas encore terminé, donc tout ce qui
+    précède est acquis. A la reprise, seuls les éléments en vol au moment de la sauvegarde sont refaits.
+    `state_fn()` renvoie le reste de l'état (paramètres du scan, résultats trouvés).
+    """
+    def __init__(self, path, state_fn, start_offset=0, interval=CHECKPOINT_INTERVAL):
+        self.path = path
+        self.state_fn = state_fn
+        self.interval = interval
+        self._next = start_offset
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+
+    def begin(self, index):
+        with self._lock:
+            self._pending.add(index)
+            self._next = max(self._next, index + 1)
+
+    def finish(self, index):
+        with self._lock:
+            self._pending.discard(index)
+            due = time.monotonic() - self._last_save >= self.interval
+            if due:
+                self._last_save = time.monotonic()
+        if due:
+            self.save()
+
+    def offset(self):
+        with self._lock:
+            return min(self._pending) if self._pending else self._next
+
+    def save(self):
+        data = self.state_fn()
+        data["offset"] = self.offset()
+        data["saved_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path) # Remplacement atomique : jamais de checkpoint à moitié écrit
+            app_logger.debug(f"Checkpoint saved to {self.path} (offset {data['offset']})")
+        except OSError as e:
+            app_logger.error(f"Failed to save checkpoint {self.path}: {e}")
+
+    def complete(self):
+        """Scan terminé : le checkpoint n'a plus lieu d'être."""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            app_logger.warning(f"Could not remove checkpoint {self.path}: {e}")
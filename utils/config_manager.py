@@ -10,7 +10,8 @@ DEFAULT_CONFIG = {
     "appearance_mode": "dark", # Peut être "light", "dark", "system"
     "font_family": "Consolas",
     "font_size": 11,
-    "discord_bot_token": "" # L'utilisateur devra mettre son propre token ici
+    "discord_bot_token": "", # L'utilisateur devra mettre son propre token ici
+    "scan_scope": [] # Réseaux autorisés pour le Port Scanner (ex: ["192.168.1.0/24"]), vide = pas de restriction
     # Ajoute d'autres paramètres par défaut ici si besoin
 }
 
@@ -0,0 +1,61 @@
+# SXTOOLS PREMIUM/utils/progress.py
+import threading
+import time
+
+class ProgressReporter:
+    """
+    Remonte l'avancement (fait/total, débit) et les résultats partiels d'une tâche longue.
+    Les résultats sont regroupés et transmis par lots à `sink(lines, done, total, rate)`,
+    au plus toutes les `flush_interval` secondes, pour ne pas inonder l'interface.
+    Utilisable depuis plusieurs threads.
+    """
+    def __init__(self, sink, total=None, flush_interval=0.25, max_batch=500):
+        self.sink = sink
+        self.total = total
+        self.done = 0
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending = []
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._last_flush = self._start
+
+    def set_total(self, total):
+        with self._lock:
+            self.total = total
+
+    def _due(self):
+        # Appelé avec le verrou
+        return (time.monotonic() - self._last_flush >= self.flush_interval
+                or len(self._pending) >= self.max_batch)
+
+    def advance(self, count=1):
+        with self._lock:
+            self.done += count
+            due = self._due()
+        if due:
+            self.flush()
+
+    def result(self, line):
+        with self._lock:
+            self._pending.append(line)
+            due = self._due()
+        if due:
+            self.flush()
+
+    def rate(self):
+        elapsed = time.monotonic() - self._start
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def flush(self):
+        with self._lock:
+            lines, self._pending = self._pending, []
+            done, total = self.done, self.total
+            self._last_flush = time.monotonic()
+        self.sink(lines, done, total, self.rate())
+
+def format_progress(done, total, rate):
+    """Ligne de statut lisible : "Progress: 1200/65535 (1.8%) - 950/s"."""
+    if total:
+        return f"Progress: {done}/{total} ({done * 100 / total:.1f}%) - {rate:.0f}/s"
+    return f"Progress: {done} - {rate:.0f}/s"
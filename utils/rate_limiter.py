@@ -0,0 +1,128 @@
+# SXTOOLS PREMIUM/utils/rate_limiter.py
+import asyncio
+import threading
+import time
+
+class TokenBucket:
+    """Seau à jetons : `rate` jetons par seconde, au plus `burst` d'avance."""
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.last = time.monotonic()
+
+    def reserve(self, now):
+        """Réserve un jeton et renvoie le délai (s) avant de pouvoir l'utiliser. Appelé sous verrou."""
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        self.tokens -= 1 # Peut devenir négatif : la dette est remboursée par l'attente
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+class Pacer:
+    """
+    Cadence partagée des sondes réseau (port scanner, subdomain finder, social finder).
+    - un seau à jetons global et un seau par cible (rates en sondes/s, None = pas de limite) ;
+    - une fenêtre de concurrence adaptative : elle double tant qu'aucune perte n'est constatée
+      (démarrage lent), puis augmente de 10% par fenêtre saine et est divisée par deux quand
+      la proportion d'échecs (timeouts, 429...) dépasse `backoff_ratio`.
+    Les sondes restées sans réponse (`timed_out=True`) comptent dans la fenêtre comme des sondes terminées :
+    un hôte filtré ne bloque donc pas la croissance. C'est une hausse brutale de leur proportion d'une fenêtre
+    à l'autre (plus de `backoff_ratio`) qui signale une perte et divise la fenêtre par deux.
+    Une instance sert soit des threads (acquire/release), soit une boucle asyncio (acquire_async/release_async).
+    """
+    def __init__(self, max_concurrency, min_concurrency=1, initial_concurrency=None,
+                 global_rate=None, per_target_rate=None, backoff_ratio=0.1):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        initial = initial_concurrency if initial_concurrency is not None else self.max_concurrency
+        self.limit = max(self.min_concurrency, min(initial, self.max_concurrency))
+        self.in_flight = 0
+        self.backoff_ratio = backoff_ratio
+        self.per_target_rate = per_target_rate
+        self.global_bucket = TokenBucket(global_rate) if global_rate else None
+        self.target_buckets = {}
+        self.slow_start = True
+        self.backoffs = 0
+        self._window_ok = 0
+        self._window_failed = 0
+        self._window_silent = 0
+        self._silent_ratio = None # Proportion de sondes sans réponse dans la fenêtre précédente
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._async_cond = None
+
+    def _reserve(self, target):
+        with self._lock:
+            now = time.monotonic()
+            delay = self.global_bucket.reserve(now) if self.global_bucket else 0.0
+            if self.per_target_rate and target is not None:
+                bucket = self.target_buckets.get(target)
+                if bucket is None:
+                    bucket = self.target_buckets[target] = TokenBucket(self.per_target_rate)
+                delay = max(delay, bucket.reserve(now))
+        return delay
+
+    def _record(self, outcome, timed_out=False):
+        """
+        outcome : True = réponse normale, False = perte/limitation, None = neutre.
+        `timed_out` : sonde restée sans réponse (voir la classe). Appelé sous verrou.
+        """
+        self.in_flight -= 1
+        if timed_out:
+            self._window_silent += 1
+        elif outcome is None:
+            return
+        elif outcome:
+            self._window_ok += 1
+        else:
+            self._window_failed += 1
+        total = self._window_ok + self._window_failed + self._window_silent
+        if total < self.limit: # Une fenêtre = autant de résultats que de sondes autorisées en vol
+            return
+        silent_ratio = self._window_silent / total
+        timeout_spike = self._silent_ratio is not None and silent_ratio - self._silent_ratio > self.backoff_ratio
+        self._silent_ratio = silent_ratio
+        if self._window_failed / total > self.backoff_ratio or timeout_spike:
+            self.limit = max(self.min_concurrency, self.limit // 2)
+            self.slow_start = False
+            self.backoffs += 1
+        elif self.slow_start:
+            self.limit = min(self.max_concurrency, self.limit * 2)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + max(1, self.limit // 10))
+        self._window_ok = self._window_failed = self._window_silent = 0
+
+    # --- Threads ---
+    def acquire(self, target=None):
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+        delay = self._reserve(target)
+        if delay > 0:
+            time.sleep(delay)
+
+    def release(self, outcome=None, timed_out=False):
+        with self._cond:
+            self._record(outcome, timed_out)
+            self._cond.notify(max(1, self.limit - self.in_flight))
+
+    # --- asyncio ---
+    async def acquire_async(self, target=None):
+        if self._async_cond is None:
+            self._async_cond = asyncio.Condition()
+        async with self._async_cond:
+            await self._async_cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        delay = self._reserve(target)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def release_async(self, outcome=None, timed_out=False):
+        with self._lock:
+            self._record(outcome, timed_out)
+        async with self._async_cond:
+            self._async_cond.notify(max(1, self.limit - self.in_flight))
+
+    def summary(self):
+        return f"Pacing: concurrency {self.limit}/{self.max_concurrency}, backoffs: {self.backoffs}"
@@ -0,0 +1,55 @@
+# SXTOOLS PREMIUM/utils/wordlist.py
+import os
+from utils.bloom import BloomFilter
+
+READ_CHUNK_SIZE = 1 << 20 # Lecture par blocs de 1 Mo : la mémoire ne dépend pas de la taille de la liste
+DEDUP_ERROR_RATE = 1e-6
+
+def estimate_words(path):
+    """
+    Estimation du nombre de lignes sans parcourir le fichier : seul le premier bloc est lu, et la longueur
+    moyenne de ses lignes est extrapolée à la taille du fichier (compte exact si le fichier tient dans un bloc).
+    Une liste de plusieurs Go est donc estimée immédiatement, avant la première sonde.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        sample = f.read(READ_CHUNK_SIZE)
+    if len(sample) >= size:
+        return sample.count(b"\n") + (sample[-1:] not in (b"\n", b""))
+    newlines = sample.count(b"\n")
+    return max(1, round(size * newlines / len(sample))) if newlines else 1
+
+def iter_wordlist(path, start_offset=0, dedup=False, capacity=None):
+    """
+    Parcourt une wordlist en flux et renvoie des couples (index, mot).
+    L'index est la position du mot parmi les lignes non vides, stable d'une exécution à l'autre :
+    il sert d'offset de checkpoint et les entrées avant `start_offset` sont sautées sans être traitées.
+    `dedup=True` saute les doublons avec un filtre de Bloom dimensionné sur `capacity` entrées
+    (par défaut, l'estimation de estimate_words) : une entrée sur un million au plus est sautée à tort.
+    """
+    seen = None
+    if dedup:
+        seen = BloomFilter(capacity or estimate_words(path) or 1, DEDUP_ERROR_RATE)
+    index = 0
+    remainder = b""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if chunk:
+                lines = (remainder + chunk).split(b"\n")
+                remainder = lines.pop() # Ligne coupée en fin de bloc : complétée au bloc suivant
+            else:
+                lines, remainder = [remainder], b""
+            for raw in lines:
+                word = raw.strip().decode('utf-8', errors='replace')
+                if not word:
+                    continue
+                # Les entrées déjà traitées alimentent aussi le filtre, pour que la reprise saute les mêmes doublons
+                if seen is not None and not seen.add(word):
+                    index += 1
+                    continue
+                if index >= start_offset:
+                    yield index, word
+                index += 1
+            if not chunk:
+                return
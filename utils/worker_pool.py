@@ -0,0 +1,56 @@
+# SXTOOLS PREMIUM/utils/worker_pool.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+SHARED_POOL_WORKERS = 64
+
+class ScanPool:
+    """
+    Ressources d'exécution partagées par plusieurs scans simultanés :
+    - un pool de threads pour les sondes bloquantes (subdomain finder) ;
+    - une boucle asyncio dans un thread dédié pour les moteurs asynchrones (port scanner, social finder).
+    Chaque scan garde sa propre file de travail, ses résultats et sa cadence : le pool ne partage que les workers.
+    """
+    def __init__(self, max_workers=SHARED_POOL_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan-pool")
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def _event_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="scan-pool-loop", daemon=True).start()
+            return self._loop
+
+    def run_async(self, coroutine):
+        """Exécute `coroutine` sur la boucle partagée et attend son résultat (appel bloquant, depuis un autre thread)."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._event_loop()).result()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+def shared_pool():
+    """Pool commun de l'application (créé au premier appel)."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ScanPool()
+        return _shared_pool
+
+def run_coroutine(coroutine, pool=None):
+    """Exécute une coroutine sur la boucle du pool partagé, ou sur une boucle privée (asyncio.run) sans pool."""
+    if pool is None:
+        return asyncio.run(coroutine)
+    return pool.run_async(coroutine)